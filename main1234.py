@@ -1,11 +1,16 @@
 import os
 import subprocess
 import tkinter as tk
+from functools import partial
 from tkinter import messagebox
 
 from scripts.line_algorithms import DDA, Bresenham, Wu
-from scripts.curve_algorithms import Circle, Ellipse, Hyperbola, Parabola
-from scripts.parametric_algorithms import HermiteAlgorithm, BezierAlgorithm, BSplineAlgorithm
+from scripts.curve_algorithms import (Circle, Ellipse, Hyperbola, Parabola, MidpointHyperbola, MidpointParabola,
+                                      FilledCircle, FilledEllipse)
+from scripts.parametric_algorithms import HermiteAlgorithm, BezierAlgorithm, BSplineAlgorithm, BSplineCurve, BezierPath
+from scripts.framebuffer import FramebufferView
+from scripts.raster_cache import RasterCache
+from scripts.grid_background import GridBackground
 
 
 class DrawingApp(tk.Tk):
@@ -17,14 +22,21 @@ class DrawingApp(tk.Tk):
         self._create_canvas()
 
         self._grid_size = 5
+        self._grid = GridBackground(self._canvas, self._grid_size)
         self._draw_grid()
 
+        self._framebuffer_mode = False
+        self._framebuffer = FramebufferView(self._canvas, scale=self._grid_size)
+        self._raster_cache = RasterCache()
+
         self._start_x = None
         self._start_y = None
 
         self._current_line_algorithm = None
         self._current_curve_algorithm = None
         self._current_parametric_algorithm = None
+        self._current_spline_algorithm = None
+        self._control_points = []
 
         self._debug_mode = False
 
@@ -41,18 +53,32 @@ class DrawingApp(tk.Tk):
         curve_menu.add_command(label="Circle", command=lambda: self._set_curve_algorithm("Circle"))
         curve_menu.add_command(label="Hyperbola", command=lambda: self._set_curve_algorithm("Hyperbola"))
         curve_menu.add_command(label="Ellipse", command=lambda: self._set_curve_algorithm("Ellipse"))
+        curve_menu.add_command(label="Circle (filled)", command=lambda: self._set_curve_algorithm("Filled circle"))
+        curve_menu.add_command(label="Ellipse (filled)", command=lambda: self._set_curve_algorithm("Filled ellipse"))
         curve_menu.add_command(label="Parabola", command=lambda: self._set_curve_algorithm("Parabola"))
+        curve_menu.add_command(label="Hyperbola (midpoint)",
+                               command=lambda: self._set_curve_algorithm("Midpoint hyperbola"))
+        curve_menu.add_command(label="Parabola (midpoint)",
+                               command=lambda: self._set_curve_algorithm("Midpoint parabola"))
         menubar.add_cascade(label="Curve", menu=curve_menu)
 
         parabola_menu = tk.Menu(menubar, tearoff=0)
         parabola_menu.add_command(label="Hermite", command=lambda: self._set_parametric_algorithm("Hermite"))
         parabola_menu.add_command(label="Bezier", command=lambda: self._set_parametric_algorithm("Bezier"))
         parabola_menu.add_command(label="BSpline", command=lambda: self._set_parametric_algorithm("BSpline"))
+        parabola_menu.add_separator()
+        parabola_menu.add_command(label="B-spline curve", command=lambda: self._set_spline_algorithm("B-spline"))
+        parabola_menu.add_command(label="B-spline curve (closed)",
+                                  command=lambda: self._set_spline_algorithm("B-spline (closed)"))
+        parabola_menu.add_command(label="Bezier path", command=lambda: self._set_spline_algorithm("Bezier path"))
+        parabola_menu.add_command(label="Bezier path (closed)",
+                                  command=lambda: self._set_spline_algorithm("Bezier path (closed)"))
         menubar.add_cascade(label="Parametric", menu=parabola_menu)
 
         menubar.add_command(label="3D", command=lambda: self._launch_script("3d_algorithms.py"))
         menubar.add_command(label="Clear", command=self._clear_canvas)
         menubar.add_checkbutton(label="Debug", command=self._toggle_debug_mode)
+        menubar.add_checkbutton(label="Framebuffer", command=self._toggle_framebuffer_mode)
 
         self.config(menu=menubar)
 
@@ -60,24 +86,36 @@ class DrawingApp(tk.Tk):
         self._canvas = tk.Canvas(self, bg="white")
         self._canvas.pack(fill=tk.BOTH, expand=True)
         self._canvas.bind("<Button-1>", self._on_canvas_click)
-        self._canvas.bind("<Configure>", lambda event: self._draw_grid())
+        self._canvas.bind("<Button-3>", self._finish_spline)
+        self._canvas.bind("<Configure>", lambda event: self._grid.schedule())
 
     def _clear_canvas(self):
         self._canvas.delete("all")
+        self._framebuffer.clear()
+        self._control_points.clear()
         self._draw_grid()
 
     def _toggle_debug_mode(self):
         self._debug_mode = not self._debug_mode
 
+    def _toggle_framebuffer_mode(self):
+        self._framebuffer_mode = not self._framebuffer_mode
+
     def _on_canvas_click(self, event):
         if any((
                 self._current_line_algorithm,
                 self._current_curve_algorithm,
-                self._current_parametric_algorithm
+                self._current_parametric_algorithm,
+                self._current_spline_algorithm
         )) is False:
             messagebox.showwarning('Warning', 'No algorithm selected.')
             return
 
+        if self._current_spline_algorithm is not None:
+            self._control_points.append((event.x // self._grid_size, event.y // self._grid_size))
+            self._canvas.create_oval(event.x - 3, event.y - 3, event.x + 3, event.y + 3, fill="red")
+            return
+
         if self._start_x is None:
             self._start_x = event.x // self._grid_size
             self._start_y = event.y // self._grid_size
@@ -90,14 +128,14 @@ class DrawingApp(tk.Tk):
             self._canvas.create_oval(event.x - 3, event.y - 3, event.x + 3, event.y + 3, fill="red")
 
             if self._current_line_algorithm is not None:
-                algorithm = self._current_line_algorithm(self._start_x, self._start_y, end_x, end_y)
+                algorithm = self._current_line_algorithm
             elif self._current_curve_algorithm is not None:
-                algorithm = self._current_curve_algorithm(self._start_x, self._start_y, end_x, end_y)
+                algorithm = self._current_curve_algorithm
             elif self._current_parametric_algorithm is not None:
-                algorithm = self._current_parametric_algorithm(self._start_x, self._start_y, end_x, end_y)
+                algorithm = self._current_parametric_algorithm
             else:
                 raise "'algorithm' variable is undeclared"
-            points_to_draw = algorithm.get_points()
+            points_to_draw = self._raster_cache.get_points(algorithm, self._start_x, self._start_y, end_x, end_y)
 
             if self._debug_mode:
                 self._draw_points_with_latency(points_to_draw, 0)
@@ -107,6 +145,20 @@ class DrawingApp(tk.Tk):
             self._start_x = None
             self._start_y = None
 
+    def _finish_spline(self, event):
+        if self._current_spline_algorithm is None:
+            return
+        if len(self._control_points) < 2:
+            messagebox.showwarning('Warning', 'Click at least two control points, then right-click.')
+            return
+        points_to_draw = self._current_spline_algorithm(self._control_points).get_points()
+        self._control_points = []
+
+        if self._debug_mode:
+            self._draw_points_with_latency(points_to_draw, 0)
+        else:
+            self._draw_points(points_to_draw)
+
     def _draw_points_with_latency(self, points, index):
         if index >= len(points):
             return
@@ -123,6 +175,9 @@ class DrawingApp(tk.Tk):
         self.after(50, lambda: self._draw_points_with_latency(points, index + 1))
 
     def _draw_points(self, points):
+        if self._framebuffer_mode:
+            self._framebuffer.draw(points)
+            return
         for point in points:
             x, y, color = point
             self._canvas.create_rectangle(
@@ -135,15 +190,7 @@ class DrawingApp(tk.Tk):
             )
 
     def _draw_grid(self):
-        self._canvas.delete("grid")
-        width = self._canvas.winfo_width()
-        height = self._canvas.winfo_height()
-
-        for x in range(0, width, self._grid_size):
-            self._canvas.create_line(x, 0, x, height, fill="lightgray", tags="grid")
-
-        for y in range(0, height, self._grid_size):
-            self._canvas.create_line(0, y, width, y, fill="lightgray", tags="grid")
+        self._grid.draw()
 
     def _set_line_algorithm(self, algorithm):
         self._uncheck_all_algorithms()
@@ -169,12 +216,24 @@ class DrawingApp(tk.Tk):
             case "Ellipse":
                 self._current_curve_algorithm = Ellipse
                 self.title("Ellipse")
+            case "Filled circle":
+                self._current_curve_algorithm = FilledCircle
+                self.title("Circle (filled)")
+            case "Filled ellipse":
+                self._current_curve_algorithm = FilledEllipse
+                self.title("Ellipse (filled)")
             case "Hyperbola":
                 self._current_curve_algorithm = Hyperbola
                 self.title("Hyperbola")
             case "Parabola":
                 self._current_curve_algorithm = Parabola
                 self.title("Parabola")
+            case "Midpoint hyperbola":
+                self._current_curve_algorithm = MidpointHyperbola
+                self.title("Hyperbola (midpoint)")
+            case "Midpoint parabola":
+                self._current_curve_algorithm = MidpointParabola
+                self.title("Parabola (midpoint)")
 
     def _set_parametric_algorithm(self, algorithm):
         self._uncheck_all_algorithms()
@@ -190,10 +249,29 @@ class DrawingApp(tk.Tk):
                 self._current_parametric_algorithm = BSplineAlgorithm
                 self.title("BSpline")
 
+    def _set_spline_algorithm(self, algorithm):
+        self._uncheck_all_algorithms()
+
+        match algorithm:
+            case "B-spline":
+                self._current_spline_algorithm = BSplineCurve
+                self.title("B-spline curve (right-click to finish)")
+            case "B-spline (closed)":
+                self._current_spline_algorithm = partial(BSplineCurve, closed=True)
+                self.title("Closed B-spline curve (right-click to finish)")
+            case "Bezier path":
+                self._current_spline_algorithm = BezierPath
+                self.title("Bezier path (right-click to finish)")
+            case "Bezier path (closed)":
+                self._current_spline_algorithm = partial(BezierPath, closed=True)
+                self.title("Closed Bezier path (right-click to finish)")
+
     def _uncheck_all_algorithms(self):
         self._current_line_algorithm = None
         self._current_curve_algorithm = None
         self._current_parametric_algorithm = None
+        self._current_spline_algorithm = None
+        self._control_points = []
 
     @staticmethod
     def _launch_script(script_name):
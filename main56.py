@@ -1,10 +1,15 @@
 import tkinter as tk
+from functools import partial
 from tkinter import messagebox
 
-from scripts.line_algorithms import DDA, Bresenham, Wu
-from scripts.polygon_algorithms import PolygonAlgorithm, Graham, Jarvis
-from scripts.fill_algorithms import ET, AEL, Flood, LBL
-from scripts.point_check import is_point_inside
+from scripts.line_algorithms import DDA, Bresenham, Wu, BATCH_ALGORITHMS
+from scripts.polygon_algorithms import PolygonAlgorithm, Graham, Jarvis, MonotoneChain, analyze_polygon
+from scripts.fill_algorithms import ET, AEL, Flood, ScanlineFlood, LBL, SpanLBL
+from scripts.point_check import PreparedPolygon
+from scripts.intersections import segment_intersection
+from scripts.pixel_buffer import PixelBuffer
+from scripts.framebuffer import FramebufferView
+from scripts.hull import OnlineHull
 
 
 class DrawingApp(tk.Tk):
@@ -12,6 +17,7 @@ class DrawingApp(tk.Tk):
         super().__init__()
         self.title("Drawing App")
         self.geometry("800x600")
+        self._live_hull_var = tk.BooleanVar(value=False)
         self._create_menu()
         self._create_canvas()
 
@@ -21,12 +27,21 @@ class DrawingApp(tk.Tk):
         self._fill_algorithm = {}
 
         self._points = []
+        self._polygon = PreparedPolygon(self._points)
+        self._analysis = None
+        self._analysis_key = None
         self.intersect_line = None
         self.intersect_point = None
 
         self._debug_mode = False
         self._debug_latency = 5
 
+        self._framebuffer_mode = False
+        self._framebuffer = FramebufferView(self._canvas, grid=None, outline=None)
+
+        self._live_hull = None
+        self._hull_tags = {}
+
         self._canvas.bind("<Button-1>", self._add_point)
 
     def _create_menu(self):
@@ -41,6 +56,7 @@ class DrawingApp(tk.Tk):
         polygon_menu = tk.Menu(menubar, tearoff=0)
         polygon_menu.add_command(label="Graham", command=lambda: self._set_polygon_algorithm("Graham"))
         polygon_menu.add_command(label="Jarvis", command=lambda: self._set_polygon_algorithm("Jarvis"))
+        polygon_menu.add_command(label="Monotone chain", command=lambda: self._set_polygon_algorithm("Monotone chain"))
         polygon_menu.add_command(label="Is point in polygon", command=self._check_point_inside)
         polygon_menu.add_command(label="Check convexity", command=self._check_convexity)
         menubar.add_cascade(label="Polygon", menu=polygon_menu)
@@ -49,12 +65,18 @@ class DrawingApp(tk.Tk):
         fill_menu.add_command(label="ET", command=lambda: self._set_fill_algorithm('ET'))
         fill_menu.add_command(label="AEL", command=lambda: self._set_fill_algorithm('AEL'))
         fill_menu.add_command(label="Flood", command=lambda: self._set_fill_algorithm('Flood'))
+        fill_menu.add_command(label="Scanline Flood", command=lambda: self._set_fill_algorithm('Scanline Flood'))
         fill_menu.add_command(label="LBL", command=lambda: self._set_fill_algorithm('LBL'))
+        fill_menu.add_command(label="LBL (spans)", command=lambda: self._set_fill_algorithm('LBL (spans)'))
+        fill_menu.add_command(label="LBL (spans, nonzero)",
+                              command=lambda: self._set_fill_algorithm('LBL (spans, nonzero)'))
         menubar.add_cascade(label="Filling", menu=fill_menu)
 
         menubar.add_command(label="Find Intersection", command=self._find_intersection)
         menubar.add_command(label="Clear", command=self._clear_canvas)
         menubar.add_checkbutton(label="Debug", command=self._toggle_debug_mode)
+        menubar.add_checkbutton(label="Framebuffer", command=self._toggle_framebuffer_mode)
+        menubar.add_checkbutton(label="Live hull", variable=self._live_hull_var, command=self._toggle_live_hull)
 
         self.config(menu=menubar)
 
@@ -64,46 +86,97 @@ class DrawingApp(tk.Tk):
 
     def _clear_canvas(self):
         self._canvas.delete("all")
+        self._framebuffer.clear()
         self._points.clear()
+        self._polygon.invalidate()
         self.intersect_point = None
         self.intersect_line = None
         self._current_fill_algorithm = None
         self._fill_algorithm = {}
+        self._hull_tags = {}
+        if self._live_hull is not None:
+            self._live_hull = OnlineHull()
+        self._analysis_key = None
 
     def _toggle_debug_mode(self):
         self._debug_mode = not self._debug_mode
 
+    def _toggle_framebuffer_mode(self):
+        self._framebuffer_mode = not self._framebuffer_mode
+
     def _add_point(self, event):
         x, y = event.x, event.y
         self._points.append((x, y))
+        self._polygon.invalidate()
         self._canvas.create_oval(x - 2, y - 2, x + 2, y + 2, fill="black")
         if len(self._points) > 1:
             self._draw_points(*self._points[-2], *self._points[-1])
-
-    def _draw_points(self, x0, y0, x1, y1, color="black"):
+        if self._live_hull is not None:
+            self._update_hull_edges(*self._live_hull.add((x, y)))
+
+    def _toggle_live_hull(self):
+        if self._live_hull is not None:
+            self._live_hull = None
+            self._canvas.delete("hull")
+            self._hull_tags = {}
+            return
+        if self._current_line_algorithm is None:
+            messagebox.showerror("Error", "No line algorithm selected")
+            self._live_hull_var.set(False)
+            return
+        self._live_hull = OnlineHull(self._points)
+        self._update_hull_edges(set(), self._live_hull.edges())
+
+    def _update_hull_edges(self, removed, added):
+        for edge in removed:
+            self._canvas.delete(self._hull_tags.pop(edge))
+        for edge in added:
+            (x0, y0), (x1, y1) = edge
+            tag = f"hull_{x0}_{y0}_{x1}_{y1}"
+            self._hull_tags[edge] = tag
+            self._draw_points(x0, y0, x1, y1, color="red", tags=("hull", tag))
+
+    def _draw_points(self, x0, y0, x1, y1, color="black", tags=()):
         if self._current_line_algorithm is None:
             messagebox.showerror("Error", "No line algorithm selected")
             return
         if x0 == x1 and y0 == y1:
-            points = [(x0, y0, color)]
+            points = PixelBuffer()
+            points.append(x0, y0, color)
         else:
             algorithm = self._current_line_algorithm(x0, y0, x1, y1, color=color)
             points = algorithm.get_points()
+        self._render_points(points, tags)
+
+    def _draw_segments(self, segments, color="black"):
+        if self._current_line_algorithm is None:
+            messagebox.showerror("Error", "No line algorithm selected")
+            return
+        if not segments:
+            return
+        algorithm = BATCH_ALGORITHMS[self._current_line_algorithm](segments, color=color)
+        self._render_points(algorithm.get_points())
+
+    def _render_points(self, points, tags=()):
         if self._debug_mode:
-            self._draw_points_with_latency(points, 0)
+            self._draw_points_with_latency(points, 0, tags)
+            return
+        # Tagged points stay canvas items so they can be deleted on their own.
+        if self._framebuffer_mode and not tags:
+            self._framebuffer.draw(points)
             return
 
         for point in points:
             x, y, draw_color = point
-            self._canvas.create_rectangle(x, y, x, y, outline=draw_color, fill=draw_color)
+            self._canvas.create_rectangle(x, y, x, y, outline=draw_color, fill=draw_color, tags=tags)
 
-    def _draw_points_with_latency(self, points, index):
+    def _draw_points_with_latency(self, points, index, tags=()):
         if index >= len(points):
             return
 
         x, y, draw_color = points[index]
-        self._canvas.create_rectangle(x, y, x, y, outline=draw_color, fill=draw_color)
-        self.after(self._debug_latency, lambda: self._draw_points_with_latency(points, index + 1))
+        self._canvas.create_rectangle(x, y, x, y, outline=draw_color, fill=draw_color, tags=tags)
+        self.after(self._debug_latency, lambda: self._draw_points_with_latency(points, index + 1, tags))
 
     """Other methods for lines and polygons"""
 
@@ -129,6 +202,8 @@ class DrawingApp(tk.Tk):
                 self._current_polygon_algorithm = Graham
             case "Jarvis":
                 self._current_polygon_algorithm = Jarvis
+            case "Monotone chain":
+                self._current_polygon_algorithm = MonotoneChain
 
         self.title(algorithm)
         print(f"Selected polygon algorithm: {algorithm}")
@@ -146,15 +221,21 @@ class DrawingApp(tk.Tk):
                 self._current_fill_algorithm = AEL
             case "Flood":
                 self._current_fill_algorithm = Flood
+            case "Scanline Flood":
+                self._current_fill_algorithm = ScanlineFlood
             case "LBL":
                 self._current_fill_algorithm = LBL
+            case "LBL (spans)":
+                self._current_fill_algorithm = SpanLBL
+            case "LBL (spans, nonzero)":
+                self._current_fill_algorithm = partial(SpanLBL, rule="nonzero")
 
         self.title(algorithm)
         print(f"Selected polygon algorithm: {algorithm}")
 
         def on_click(event):
             x, y = event.x, event.y
-            if not is_point_inside(self._points, x, y):
+            if not self._polygon.is_point_inside(x, y):
                 messagebox.showerror("Error", "Point must be inside polygon")
             else:
                 self._fill(x, y)
@@ -169,28 +250,37 @@ class DrawingApp(tk.Tk):
         points = algorithm.get_points()
 
         # self._canvas.delete("polygon")
-        for i in range(len(points)):
-            self._draw_points(*points[i], *points[(i + 1) % len(points)], color="red")
+        edges = [(*points[i], *points[(i + 1) % len(points)]) for i in range(len(points))]
+        self._draw_segments(edges, color="red")
 
     def _fill(self, x, y):
+        if not self._polygon_analysis().simple and not messagebox.askyesno(
+                "Self-intersecting polygon", "The polygon intersects itself. Fill it anyway?"):
+            return
+
         algorithm = self._current_fill_algorithm(self._points, x, y)
         points = algorithm.get_points()
-        for i in range(len(points)):
-            self._draw_points(*points[i], color="blue")
+        self._draw_segments(points, color="blue")
 
     def _check_convexity(self):
         if len(self._points) < 3:
             messagebox.showerror("Error", "Not enough points to check convexity")
             return
 
-        normals = PolygonAlgorithm(self._points).check_convexity()
+        normals = PolygonAlgorithm(self._points).check_convexity(self._polygon_analysis())
         if normals is None:
             messagebox.showinfo("Result", "Polygon is not convex")
         else:
-            for normal in normals:
-                self._draw_points(*normal, color="green")
+            self._draw_segments(normals, color="green")
             messagebox.showinfo("Result", "Polygon is convex")
 
+    def _polygon_analysis(self):
+        key = (len(self._points), self._points[-1] if self._points else None)
+        if key != self._analysis_key:
+            self._analysis = analyze_polygon(self._points)
+            self._analysis_key = key
+        return self._analysis
+
     def _find_intersection(self):
         if len(self._points) < 3:
             messagebox.showerror("Error", "Not enough points to build polygon.")
@@ -212,27 +302,7 @@ class DrawingApp(tk.Tk):
             self._canvas.unbind("<Button-1>")
             self._canvas.bind("<Button-1>", self._add_point)
 
-            def calculate_intersection(p1, p2, poly):
-                intersection_points = []
-                x1, y1 = p1
-                x2, y2 = p2
-                for i in range(len(poly)):
-                    x3, y3 = poly[i]
-                    x4, y4 = poly[(i + 1) % len(poly)]
-
-                    d = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
-                    if d == 0:
-                        continue
-
-                    t = ((x1 - x3) * (y3 - y4) - (y1 - y3) * (x3 - x4)) / d
-                    u = ((x1 - x3) * (y1 - y2) - (y1 - y3) * (x1 - x2)) / d
-                    if 0 <= t <= 1 and 0 <= u <= 1:
-                        x = x1 + t * (x2 - x1)
-                        y = y1 + t * (y2 - y1)
-                        intersection_points.append((x, y))
-                return intersection_points
-
-            intersections = calculate_intersection((x1, y1), (x2, y2), self._points)
+            intersections = segment_intersection((x1, y1), (x2, y2), self._points)
             if intersections:
                 for intersection in intersections:
                     x, y = intersection
@@ -253,7 +323,7 @@ class DrawingApp(tk.Tk):
 
         def on_click(event):
             x, y = event.x, event.y
-            if is_point_inside(self._points, x, y):
+            if self._polygon.is_point_inside(x, y):
                 messagebox.showinfo("Result", f"Point ({x}, {y}) is in polygon.")
             else:
                 messagebox.showinfo("Result", f"Point ({x}, {y}) is not in polygon.")
@@ -1,8 +1,13 @@
-import math
-import random
 import tkinter as tk
 from tkinter import messagebox
 
+from scripts.pixel_buffer import PixelBuffer
+from scripts.framebuffer import FramebufferView
+from scripts.grid_background import GridBackground
+from scripts.delaunay import Delaunay, super_triangle
+from scripts.fortune import FortuneVoronoi, cross_check
+from scripts.voronoi import voronoi_labels, jump_flood_labels, label_error, site_colors, labels_to_pixels
+
 
 class VoronoigApp(tk.Tk):
 
@@ -14,53 +19,68 @@ class VoronoigApp(tk.Tk):
         self._create_canvas()
 
         self._grid_size = 15
+        self._grid = GridBackground(self._canvas, self._grid_size)
         self._draw_grid()
 
+        self._framebuffer_mode = False
+        self._framebuffer = FramebufferView(self._canvas, scale=self._grid_size)
+
         self._x = None
         self._y = None
         self._points = []
+        self._triangulation = self._new_triangulation()
+        self._delaunay_items = {}
+        self._show_delaunay = False
 
         self._debug_mode = False
         self._debug_latency = 20
 
+        self._jump_flood = False
+
     def _create_menu(self):
         menubar = tk.Menu(self)
         menubar.add_command(label="Voronoi", command=self._voronoi)
+        menubar.add_checkbutton(label="Jump flooding", command=self._toggle_jump_flood)
+        menubar.add_command(label="Voronoi (vector)", command=self._voronoi_vector)
         menubar.add_command(label="Delaunay", command=self._delaunay)
         menubar.add_command(label="Clear", command=self._clear_canvas)
         menubar.add_checkbutton(label="Debug", command=self._toggle_debug_mode)
+        menubar.add_checkbutton(label="Framebuffer", command=self._toggle_framebuffer_mode)
         self.config(menu=menubar)
 
     def _create_canvas(self):
         self._canvas = tk.Canvas(self, bg="white")
         self._canvas.pack(fill=tk.BOTH, expand=True)
         self._canvas.bind("<Button-1>", self._on_canvas_click)
-        self._canvas.bind("<Configure>", lambda event: self._draw_grid())
+        self._canvas.bind("<Configure>", lambda event: self._grid.schedule())
 
     def _draw_grid(self):
-        self._canvas.delete("grid")
-        width = self._canvas.winfo_width()
-        height = self._canvas.winfo_height()
-
-        for x in range(0, width, self._grid_size):
-            self._canvas.create_line(x, 0, x, height, fill="lightgray", tags="grid")
-
-        for y in range(0, height, self._grid_size):
-            self._canvas.create_line(0, y, width, y, fill="lightgray", tags="grid")
+        self._grid.draw()
 
     def _clear_canvas(self):
         self._canvas.delete("all")
+        self._framebuffer.clear()
         self._points = []
+        self._triangulation = self._new_triangulation()
+        self._delaunay_items = {}
+        self._show_delaunay = False
         self._draw_grid()
 
     def _toggle_debug_mode(self):
         self._debug_mode = not self._debug_mode
 
+    def _toggle_framebuffer_mode(self):
+        self._framebuffer_mode = not self._framebuffer_mode
+
+    def _toggle_jump_flood(self):
+        self._jump_flood = not self._jump_flood
+
     def _on_canvas_click(self, event):
         self._x = event.x // self._grid_size
         self._y = event.y // self._grid_size
         self._points.append([self._x, self._y])
         self._canvas.create_oval(event.x - 3, event.y - 3, event.x + 3, event.y + 3, fill="red")
+        self._insert_site((self._x, self._y))
 
     def _draw_points_with_latency(self, points, index):
         if index >= len(points):
@@ -78,7 +98,9 @@ class VoronoigApp(tk.Tk):
         self.after(self._debug_latency, lambda: self._draw_points_with_latency(points, index + 1))
 
     def _draw_points(self, points):
-        if not self._debug_mode:
+        if self._framebuffer_mode and not self._debug_mode:
+            self._framebuffer.draw(points)
+        elif not self._debug_mode:
             for point in points:
                 x, y, color = point
                 self._canvas.create_rectangle(
@@ -100,109 +122,88 @@ class VoronoigApp(tk.Tk):
         width = self._canvas.winfo_width() // self._grid_size
         height = self._canvas.winfo_height() // self._grid_size
 
-        pixels = []
-        for x in range(width):
-            for y in range(height):
-                closest_point_index = -1
-                min_distance = float('inf')
-
-                for i, (px, py) in enumerate(self._points):
-                    distance = math.sqrt((x - px) ** 2 + (y - py) ** 2)
-                    if distance < min_distance:
-                        min_distance = distance
-                        closest_point_index = i
+        if self._jump_flood:
+            labels = jump_flood_labels(self._points, width, height)
+            if self._debug_mode:
+                error = label_error(self._points, labels, voronoi_labels(self._points, width, height))
+                print(f"Jump flooding max error: {error:.3f} cells")
+        else:
+            labels = voronoi_labels(self._points, width, height)
+        if self._framebuffer_mode and not self._debug_mode:
+            self._framebuffer.draw_labels(labels, site_colors(len(self._points)))
+        else:
+            self._draw_points(labels_to_pixels(labels, PixelBuffer()))
 
-                if closest_point_index != -1:
-                    random.seed(closest_point_index)
-                    color = "#{:02x}{:02x}{:02x}".format(
-                        random.randint(0, 255),
-                        random.randint(0, 255),
-                        random.randint(0, 255))
-                    pixels.append((x, y, color))
+    def _voronoi_vector(self):
+        if len(self._points) < 2:
+            messagebox.showerror("Error", "Not enough points to build voronoi.")
+            return
 
-        self._draw_points(pixels)
+        width = self._canvas.winfo_width() // self._grid_size
+        height = self._canvas.winfo_height() // self._grid_size
+        diagram = FortuneVoronoi(self._points, (-0.5, -0.5, width - 0.5, height - 0.5))
+
+        self._canvas.delete("voronoi")
+        for _, _, (x1, y1), (x2, y2) in diagram.edges:
+            self._canvas.create_line(
+                x1 * self._grid_size + self._grid_size / 2,
+                y1 * self._grid_size + self._grid_size / 2,
+                x2 * self._grid_size + self._grid_size / 2,
+                y2 * self._grid_size + self._grid_size / 2,
+                fill="black", width=2, tags="voronoi")
+
+        if self._debug_mode:
+            mismatches = cross_check(diagram, voronoi_labels(self._points, width, height))
+            print(f"Vector Voronoi: {len(diagram.edges)} edges, {len(diagram.vertices)} vertices, "
+                  f"{len(mismatches)} raster adjacencies without an edge")
 
     def _delaunay(self):
         if len(self._points) < 3:
             messagebox.showerror("Error", "Not enough points to build Delaunay triangulation.")
             return
 
-        points = [tuple(pt) for pt in self._points]
-
-        def circumcircle(tri):
-            (ax, ay), (bx, by), (cx, cy) = tri
-            d = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
-            if d == 0:
-                return None, None, None
-            ux = ((ax * ax + ay * ay) * (by - cy) +
-                  (bx * bx + by * by) * (cy - ay) +
-                  (cx * cx + cy * cy) * (ay - by)) / d
-            uy = ((ax * ax + ay * ay) * (cx - bx) +
-                  (bx * bx + by * by) * (ax - cx) +
-                  (cx * cx + cy * cy) * (bx - ax)) / d
-            r = math.hypot(ax - ux, ay - uy)
-            return ux, uy, r
-
-        def triangle_edges(tri):
-            p, q, r = tri
-            edge1 = tuple(sorted((p, q)))
-            edge2 = tuple(sorted((q, r)))
-            edge3 = tuple(sorted((r, p)))
-            return [edge1, edge2, edge3]
-
-        min_x = min(p[0] for p in points)
-        min_y = min(p[1] for p in points)
-        max_x = max(p[0] for p in points)
-        max_y = max(p[1] for p in points)
-        dx = max_x - min_x
-        dy = max_y - min_y
-        delta_max = max(dx, dy)
-        mid_x = (min_x + max_x) / 2
-        mid_y = (min_y + max_y) / 2
-
-        p1 = (mid_x - 2 * delta_max, mid_y - delta_max)
-        p2 = (mid_x, mid_y + 2 * delta_max)
-        p3 = (mid_x + 2 * delta_max, mid_y - delta_max)
-        super_triangle = (p1, p2, p3)
-
-        triangles = [super_triangle]
-
-        for p in points:
-            bad_triangles = []
-            for tri in triangles:
-                cc = circumcircle(tri)
-                if cc[0] is None:
-                    continue
-                ux, uy, r = cc
-                if math.hypot(p[0] - ux, p[1] - uy) <= r:
-                    bad_triangles.append(tri)
-
-            edge_count = {}
-            for tri in bad_triangles:
-                for edge in triangle_edges(tri):
-                    edge_count[edge] = edge_count.get(edge, 0) + 1
-
-            polygon = [edge for edge, count in edge_count.items() if count == 1]
-
-            triangles = [tri for tri in triangles if tri not in bad_triangles]
-
-            for edge in polygon:
-                new_triangle = (edge[0], edge[1], p)
-                triangles.append(new_triangle)
-
-        triangles = [tri for tri in triangles if p1 not in tri and p2 not in tri and p3 not in tri]
-
-        drawn_edges = set()
-        for tri in triangles:
-            for edge in triangle_edges(tri):
-                if edge not in drawn_edges:
-                    drawn_edges.add(edge)
-                    (x1, y1), (x2, y2) = edge
-                    canvas_x1 = x1 * self._grid_size + self._grid_size / 2
-                    canvas_y1 = y1 * self._grid_size + self._grid_size / 2
-                    canvas_x2 = x2 * self._grid_size + self._grid_size / 2
-                    canvas_y2 = y2 * self._grid_size + self._grid_size / 2
-                    self._canvas.create_line(canvas_x1, canvas_y1, canvas_x2, canvas_y2, fill="blue", width=2)
+        self._show_delaunay = True
+        self._redraw_delaunay()
+
+    def _new_triangulation(self, points=()):
+        width = self.winfo_screenwidth() // self._grid_size
+        height = self.winfo_screenheight() // self._grid_size
+        corners = [(-width, -height), (2 * width, 2 * height)] + [tuple(p) for p in points]
+        triangulation = Delaunay(super_triangle(corners))
+        for point in points:
+            triangulation.insert(point)
+        return triangulation
+
+    def _insert_site(self, point):
+        change = self._triangulation.insert(point)
+        if change is None:
+            if self._triangulation.contains(point):
+                return
+            self._triangulation = self._new_triangulation(self._points)
+            if self._show_delaunay:
+                self._redraw_delaunay()
+            return
+        if self._show_delaunay:
+            removed, added = change
+            for edge in removed:
+                self._canvas.delete(self._delaunay_items.pop(edge))
+            for edge in added:
+                self._draw_delaunay_edge(edge)
+
+    def _redraw_delaunay(self):
+        self._canvas.delete("delaunay")
+        self._delaunay_items = {}
+        for edge in self._triangulation.edges():
+            self._draw_delaunay_edge(edge)
+
+    def _draw_delaunay_edge(self, edge):
+        (x1, y1), (x2, y2) = edge
+        canvas_x1 = x1 * self._grid_size + self._grid_size / 2
+        canvas_y1 = y1 * self._grid_size + self._grid_size / 2
+        canvas_x2 = x2 * self._grid_size + self._grid_size / 2
+        canvas_y2 = y2 * self._grid_size + self._grid_size / 2
+        self._delaunay_items[edge] = self._canvas.create_line(
+            canvas_x1, canvas_y1, canvas_x2, canvas_y2, fill="blue", width=2, tags="delaunay")
 
 
 def main():
@@ -1,3 +1,7 @@
+import os
+import re
+import zipfile
+
 import pygame
 from pygame.locals import *
 from OpenGL.GL import *
@@ -5,26 +9,151 @@ import numpy as np
 from tkinter import filedialog
 
 
-def load_object(filename):
-    vertices = []
-    faces = []
+OBJ_CHUNK_BYTES = 1 << 22
+
+
+def load_object(filename, use_cache=True):
+    """
+    Reads the vertices and faces of an OBJ file. Returns float32 (N, 3) vertices and
+    the faces in CSR form: the vertex indices of face i are indices[offsets[i]:offsets[i + 1]].
+    The arrays are saved next to the file as `<filename>.npz` and loaded from there
+    instead of parsing while the file's mtime and size are unchanged.
+    """
     try:
-        with open(filename, 'r') as f:
-            for line in f:
-                parts = line.split()
-                if not parts:
-                    continue
-                if parts[0] == 'v':
-                    vertices.append([float(x) for x in parts[1:4]] + [1])
-                elif parts[0] == 'f':
-                    faces.append([int(x.split('/')[0]) - 1 for x in parts[1:]])
-        if not vertices or not faces:
-            raise ValueError("The file does not contain any vertices or faces")
-        return np.array(vertices, dtype=np.float32), faces
+        stat = os.stat(filename)
     except FileNotFoundError:
         raise FileNotFoundError(f"File not found: {filename}")
+    cache_path = filename + ".npz"
+    if use_cache:
+        mesh = _read_mesh_cache(cache_path, stat)
+        if mesh is not None:
+            return mesh
+    try:
+        mesh = _parse_object(filename)
     except ValueError as e:
         raise ValueError(f"Error when reading a file: {e}")
+    if use_cache:
+        _write_mesh_cache(cache_path, stat, *mesh)
+    return mesh
+
+
+def _parse_object(filename):
+    """
+    Parses the file in chunks of about OBJ_CHUNK_BYTES whole lines. The v and f lines
+    of a chunk are picked out with byte masks and their numbers are read by NumPy in
+    one call per chunk, so only the resulting arrays outlive a chunk.
+    """
+    vertex_chunks, count_chunks, index_chunks = [], [], []
+    vertex_count = 0
+    with open(filename, 'rb') as f:
+        rest = b""
+        while True:
+            data = f.read(OBJ_CHUNK_BYTES)
+            chunk = rest + data
+            if data:
+                cut = chunk.rfind(b"\n") + 1
+                chunk, rest = chunk[:cut], chunk[cut:]
+            if not chunk:
+                if not data:
+                    break
+                continue
+            vertices, counts, indices, seen = _parse_chunk(chunk)
+            indices = np.where(indices < 0, indices + vertex_count + np.repeat(seen, counts), indices - 1)
+            vertex_chunks.append(vertices)
+            count_chunks.append(counts)
+            index_chunks.append(indices)
+            vertex_count += len(vertices)
+            if not data:
+                break
+
+    vertices = np.concatenate(vertex_chunks) if vertex_chunks else np.zeros((0, 3), dtype=np.float32)
+    counts = np.concatenate(count_chunks) if count_chunks else np.zeros(0, dtype=np.int64)
+    indices = np.concatenate(index_chunks) if index_chunks else np.zeros(0, dtype=np.int64)
+    if not len(vertices) or not len(counts):
+        raise ValueError("The file does not contain any vertices or faces")
+    if len(indices) and (indices.min() < 0 or indices.max() >= len(vertices)):
+        raise ValueError("A face refers to a missing vertex")
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return vertices, offsets, indices.astype(np.int32)
+
+
+def _parse_chunk(chunk):
+    """
+    Vertices, face sizes, raw (1-based or negative) face indices and, per face, the
+    number of vertices before it in this chunk, for a run of whole lines.
+    """
+    buffer = np.frombuffer(chunk, dtype=np.uint8).copy()
+    starts = np.concatenate(([0], np.flatnonzero(buffer == ord("\n"))[:-1] + 1))
+    if np.any((buffer[starts] == ord(" ")) | (buffer[starts] == ord("\t"))):
+        # Indented lines: drop the leading blanks so the keyword is the first byte.
+        buffer = np.frombuffer(re.sub(rb"(?m)^[ \t]+", b"", chunk), dtype=np.uint8).copy()
+        if not len(buffer):
+            return np.zeros((0, 3), dtype=np.float32), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), \
+                np.zeros(0, dtype=np.int64)
+        starts = np.concatenate(([0], np.flatnonzero(buffer == ord("\n"))[:-1] + 1))
+    lengths = np.diff(np.append(starts, len(buffer)))
+    first = buffer[starts]
+    second = buffer[np.minimum(starts + 1, len(buffer) - 1)]
+    separated = (lengths > 1) & ((second == ord(" ")) | (second == ord("\t")))
+    is_vertex = separated & (first == ord("v"))
+    is_face = separated & (first == ord("f"))
+
+    # Vertex lines without their "v", read three numbers per line.
+    buffer[starts[is_vertex]] = ord(" ")
+    text = buffer[np.repeat(is_vertex, lengths)].tobytes()
+    vertices = np.fromstring(text, dtype=np.float32, sep=" ")
+    if len(vertices) != 3 * np.count_nonzero(is_vertex):
+        # Some lines carry w or a color: keep x, y, z of each.
+        vertices = np.array([row.split()[:3] for row in text.splitlines()], dtype=np.float32)
+    vertices = vertices.reshape(-1, 3)
+
+    # Face lines with "f" turned into the index 0, which OBJ never uses, as a face
+    # separator, and everything from a "/" to the next blank (texture and normal) dropped.
+    buffer[starts[is_face]] = ord("0")
+    faces = buffer[np.repeat(is_face, lengths)]
+    slash = faces == ord("/")
+    if slash.any():
+        position = np.arange(len(faces), dtype=np.int32)
+        last_slash = np.maximum.accumulate(np.where(slash, position, -1))
+        last_blank = np.maximum.accumulate(np.where(faces <= ord(" "), position, -1))
+        faces = faces[last_slash <= last_blank]
+    values = np.fromstring(faces.tobytes(), dtype=np.int64, sep=" ")
+    heads = np.flatnonzero(values == 0)
+    if len(heads) != np.count_nonzero(is_face):
+        raise ValueError("Face index 0 or malformed face line")
+    counts = np.diff(np.append(heads, len(values))) - 1
+    indices = np.delete(values, heads)
+    seen = np.cumsum(is_vertex)[is_face]
+    return vertices, counts, indices, seen
+
+
+def _read_mesh_cache(path, stat):
+    try:
+        with np.load(path) as cache:
+            if cache["source"].tolist() != [stat.st_mtime_ns, stat.st_size]:
+                return None
+            return cache["vertices"], cache["offsets"], cache["indices"]
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+
+def _write_mesh_cache(path, stat, vertices, offsets, indices):
+    source = np.array([stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+    try:
+        with open(path + ".tmp", 'wb') as f:
+            np.savez(f, vertices=vertices, offsets=offsets, indices=indices, source=source)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass
+
+
+def face_edges(offsets, indices):
+    """(E, 2) vertex pairs of every face side, each face closed back to its first vertex."""
+    following = np.arange(1, len(indices) + 1)
+    counts = np.diff(offsets)
+    following[offsets[1:][counts > 0] - 1] = offsets[:-1][counts > 0]
+    return np.column_stack((indices, indices[following])).astype(np.uint32)
 
 
 def apply_transformation(vertices, matrix):
@@ -35,14 +164,12 @@ def apply_transformation(vertices, matrix):
     return transformed_vertices
 
 
-def draw_object(vertices, faces):
+def draw_object(vertices, edges):
     glColor3f(0.0, 0.0, 0.0)
-    glBegin(GL_LINES)
-    for face in faces:
-        for i in range(len(face)):
-            glVertex3fv(vertices[face[i]][:3])
-            glVertex3fv(vertices[face[(i + 1) % len(face)]][:3])
-    glEnd()
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, np.ascontiguousarray(vertices[:, :3], dtype=np.float32))
+    glDrawElements(GL_LINES, edges.size, GL_UNSIGNED_INT, edges)
+    glDisableClientState(GL_VERTEX_ARRAY)
 
 
 def get_perspective_matrix(fov, aspect, near, far):
@@ -88,14 +215,14 @@ def open_file_button_action():
     file_path = choose_file()
     if file_path:
         try:
-            vertices, faces = load_object(file_path)
+            vertices, offsets, indices = load_object(file_path)
             print(f"The file {file_path} has been uploaded successfully.")
-            open_gl_view(vertices, faces)
+            open_gl_view(vertices, face_edges(offsets, indices))
         except Exception as e:
             print(f"Error when uploading a file: {e}")
 
 
-def open_gl_view(vertices, faces):
+def open_gl_view(vertices, edges):
     pygame.init()
     display = (1600, 1200)
     pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
@@ -184,7 +311,7 @@ def open_gl_view(vertices, faces):
         transformed_vertices = apply_transformation(vertices, np.dot(object_transformation, projection_matrix))
 
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        draw_object(transformed_vertices, faces)
+        draw_object(transformed_vertices, edges)
         pygame.display.flip()
         pygame.time.wait(10)
         last_time = now_time
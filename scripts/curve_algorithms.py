@@ -1,4 +1,9 @@
 import math
+from functools import lru_cache
+
+import numpy as np
+
+from scripts.pixel_buffer import PixelBuffer
 
 
 class CurveAlgorithm:
@@ -12,13 +17,14 @@ class CurveAlgorithm:
 
 class Circle(CurveAlgorithm):
     def get_points(self):
-        points = []
+        points = PixelBuffer()
         radius = int(math.sqrt((self.x1 - self.x0) ** 2 + (self.y1 - self.y0) ** 2))
         x, y = 0, radius
         d = 3 - 2 * radius
         while x <= y:
-            for dx, dy in [(x, y), (-x, y), (x, -y), (-x, -y), (y, x), (-y, x), (y, -x), (-y, -x)]:
-                points.append((self.x0 + dx, self.y0 + dy, self.color))
+            # Octants meet on the axes and the diagonal, plot each pixel there once.
+            for dx, dy in dict.fromkeys([(x, y), (-x, y), (x, -y), (-x, -y), (y, x), (-y, x), (y, -x), (-y, -x)]):
+                points.append(self.x0 + dx, self.y0 + dy, self.color)
             if d < 0:
                 d += 4 * x + 6
             else:
@@ -30,7 +36,7 @@ class Circle(CurveAlgorithm):
 
 class Ellipse(CurveAlgorithm):
     def get_points(self):
-        points = []
+        points = PixelBuffer()
         a = abs(self.x1 - self.x0) // 2
         b = abs(self.y1 - self.y0) // 2
         xc, yc = self.x0, self.y0
@@ -38,10 +44,11 @@ class Ellipse(CurveAlgorithm):
         d1 = b * b - a * a * b + 0.25 * a * a
         dx = 2 * b * b * x
         dy = 2 * a * a * y
+        # Quadrants meet on the axes, plot each pixel there once.
         # Horizontal movement
         while dx < dy:
-            points.extend([(xc + x, yc + y, self.color), (xc - x, yc + y, self.color),
-                           (xc + x, yc - y, self.color), (xc - x, yc - y, self.color)])
+            for px, py in dict.fromkeys(((xc + x, yc + y), (xc - x, yc + y), (xc + x, yc - y), (xc - x, yc - y))):
+                points.append(px, py, self.color)
             if d1 < 0:
                 x += 1
                 dx += 2 * b * b
@@ -55,8 +62,8 @@ class Ellipse(CurveAlgorithm):
         d2 = b * b * (x + 0.5) * (x + 0.5) + a * a * (y - 1) * (y - 1) - a * a * b * b
         # Vertical movement
         while y >= 0:
-            points.extend([(xc + x, yc + y, self.color), (xc - x, yc + y, self.color),
-                           (xc + x, yc - y, self.color), (xc - x, yc - y, self.color)])
+            for px, py in dict.fromkeys(((xc + x, yc + y), (xc - x, yc + y), (xc + x, yc - y), (xc - x, yc - y))):
+                points.append(px, py, self.color)
             if d2 > 0:
                 y -= 1
                 dy -= 2 * a * a
@@ -73,13 +80,14 @@ class Ellipse(CurveAlgorithm):
 class Hyperbola(CurveAlgorithm):
     #  y = b * sqrt(1 + (x/a) ** 2)
     def get_points(self):
-        points = []
+        points = PixelBuffer()
         a = max(abs(self.x1 - self.x0), 1)
         b = max(abs(self.y1 - self.y0) // 2, 1)
         for x in range(-a, a + 1):
             try:
                 y = int(b * math.sqrt(1 + (x / a) ** 2))
-                points.extend([(self.x0 + x, self.y0 + y, self.color), (self.x0 + x, self.y0 - y, self.color)])
+                points.append(self.x0 + x, self.y0 + y, self.color)
+                points.append(self.x0 + x, self.y0 - y, self.color)
             except ValueError:
                 continue
         return points
@@ -88,12 +96,221 @@ class Hyperbola(CurveAlgorithm):
 class Parabola(CurveAlgorithm):
     # y = x ** 2 / 4 * p
     def get_points(self):
-        points = []
+        points = PixelBuffer()
         p = max(abs(self.y1 - self.y0) // 2, 1)
         for x in range(-abs(self.x1 - self.x0), abs(self.x1 - self.x0) + 1):
             try:
                 y = int((x ** 2) / (4 * p))
-                points.append((self.x0 + x, self.y0 + y, self.color))
+                points.append(self.x0 + x, self.y0 + y, self.color)
             except ValueError:
                 continue
         return points
+
+
+class MidpointHyperbola(CurveAlgorithm):
+    """
+    Same branches as Hyperbola, a^2 y^2 - b^2 x^2 = a^2 b^2 for |x| <= a, with an
+    integer midpoint decision variable: x-major while the slope is below 1, then
+    y-major, one pixel per step.
+    """
+
+    def get_points(self):
+        points = PixelBuffer()
+        a = max(abs(self.x1 - self.x0), 1)
+        b = max(abs(self.y1 - self.y0) // 2, 1)
+        aa, bb = a * a, b * b
+        # Nearest integer to b * sqrt(2), the branch height at x = a.
+        y_end = math.isqrt(2 * bb)
+        if 2 * bb - y_end * y_end > y_end:
+            y_end += 1
+
+        def plot(x, y):
+            for px in ((x, -x) if x else (x,)):
+                points.append(self.x0 + px, self.y0 + y, self.color)
+                points.append(self.x0 + px, self.y0 - y, self.color)
+
+        x, y = 0, b
+        plot(x, y)
+        # Region 1: step x, the midpoint (x + 1, y + 1/2) decides on y.
+        d = aa * (2 * y + 1) ** 2 - 4 * bb * (x + 1) ** 2 - 4 * aa * bb
+        while x < a and 2 * bb * (x + 1) <= aa * (2 * y + 1):
+            step_y = d < 0
+            d -= 4 * bb * (2 * x + 3)
+            x += 1
+            if step_y:
+                d += 8 * aa * (y + 1)
+                y += 1
+            plot(x, y)
+        # Region 2: step y, the midpoint (x + 1/2, y + 1) decides on x, up to x = a.
+        e = 4 * aa * (y + 1) ** 2 - bb * (2 * x + 1) ** 2 - 4 * aa * bb
+        while y < y_end:
+            step_x = e > 0 and x < a
+            e += 4 * aa * (2 * y + 3)
+            y += 1
+            if step_x:
+                e -= 8 * bb * (x + 1)
+                x += 1
+            plot(x, y)
+        return points
+
+
+class MidpointParabola(CurveAlgorithm):
+    """
+    Same curve as Parabola, x^2 = 4 p y for |x| <= w, with an integer midpoint
+    decision variable: x-major up to x = 2p where the slope reaches 1, then y-major,
+    one pixel per step.
+    """
+
+    def get_points(self):
+        points = PixelBuffer()
+        p = max(abs(self.y1 - self.y0) // 2, 1)
+        w = abs(self.x1 - self.x0)
+        # Nearest integer to w^2 / 4p, the height at x = w.
+        y_end = (w * w + 2 * p) // (4 * p)
+
+        def plot(x, y):
+            for px in ((x, -x) if x else (x,)):
+                points.append(self.x0 + px, self.y0 + y, self.color)
+
+        x, y = 0, 0
+        plot(x, y)
+        # Region 1: step x, the midpoint (x + 1, y + 1/2) decides on y.
+        d = 2 * (x + 1) ** 2 - 4 * p * (2 * y + 1)
+        while x < w and x < 2 * p:
+            step_y = d > 0
+            d += 2 * (2 * x + 3)
+            x += 1
+            if step_y:
+                d -= 8 * p
+                y += 1
+            plot(x, y)
+        # Region 2: step y, the midpoint (x + 1/2, y + 1) decides on x, up to x = w.
+        e = (2 * x + 1) ** 2 - 16 * p * (y + 1)
+        while y < y_end:
+            step_x = e < 0 and x < w
+            e -= 16 * p
+            y += 1
+            if step_x:
+                e += 8 * (x + 1)
+                x += 1
+            plot(x, y)
+        return points
+
+
+# Patterns kept for the most recently drawn sizes.
+PATTERN_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def _outline(key):
+    """Outline offsets of a circle ("circle", r) or ellipse ("ellipse", a, b) at the origin, cached."""
+    if key[0] == "circle":
+        algorithm = Circle(0, 0, key[1], 0)
+    else:
+        algorithm = Ellipse(0, 0, 2 * key[1], 2 * key[2])
+    xs, ys, _ = algorithm.get_points().as_arrays()
+    return xs.astype(np.int64), ys.astype(np.int64)
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def _spans(key):
+    """Rows of the filled shape as (dy, x_start, x_end) offset arrays, from the outline's extent per row."""
+    xs, ys = _outline(key)
+    rows, inverse = np.unique(ys, return_inverse=True)
+    start = np.full(len(rows), np.iinfo(np.int64).max)
+    end = np.full(len(rows), np.iinfo(np.int64).min)
+    np.minimum.at(start, inverse, xs)
+    np.maximum.at(end, inverse, xs)
+    return rows, start, end
+
+
+class CurveBatchAlgorithm:
+    """
+    Rasterizes many circles or ellipses in one call.
+    `centers` is an (N, 2) array; shapes of the same size share one outline pattern,
+    computed once with the scalar algorithm and placed at every center with array
+    arithmetic. `get_arrays` returns x, y and offsets, where the pixels of shape i are
+    x[offsets[i]:offsets[i + 1]]. With filled=True the shapes are drawn as the
+    horizontal spans `get_spans` returns. Subclasses define `_keys`, which returns
+    the distinct pattern keys and the index of each shape's key.
+    """
+
+    def __init__(self, centers, color="green", filled=False):
+        self.centers = np.asarray(centers, dtype=np.int64).reshape(-1, 2)
+        self.color = color
+        self.filled = filled
+
+    def _place(self, patterns, width):
+        """Concatenates the `width` pattern columns of every shape, in shape order."""
+        keys, inverse = self._keys()
+        parts = [patterns(key) for key in keys]
+        counts = np.array([len(part[0]) for part in parts], dtype=np.int64)
+        pattern_start = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+        columns = [np.concatenate([part[k] for part in parts] + [np.zeros(0, np.int64)]) for k in range(width)]
+
+        shape_counts = counts[inverse]
+        offsets = np.zeros(len(shape_counts) + 1, dtype=np.int64)
+        np.cumsum(shape_counts, out=offsets[1:])
+        shape = np.repeat(np.arange(len(shape_counts)), shape_counts)
+        index = pattern_start[inverse[shape]] + np.arange(offsets[-1]) - offsets[shape]
+        return shape, [column[index] for column in columns], offsets
+
+    def get_arrays(self):
+        shape, (dx, dy), offsets = self._place(_outline, 2)
+        return self.centers[shape, 0] + dx, self.centers[shape, 1] + dy, offsets
+
+    def get_spans(self):
+        """(M, 4) array of x_start, y, x_end, y rows covering every shape, row by row."""
+        shape, (dy, start, end), _ = self._place(_spans, 3)
+        cx, cy = self.centers[shape, 0], self.centers[shape, 1]
+        return np.column_stack((cx + start, cy + dy, cx + end, cy + dy))
+
+    def get_points(self):
+        points = PixelBuffer()
+        if not self.filled:
+            xs, ys, _ = self.get_arrays()
+        else:
+            spans = self.get_spans()
+            counts = spans[:, 2] - spans[:, 0] + 1
+            row = np.repeat(np.arange(len(spans)), counts)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            xs = spans[row, 0] + np.arange(len(row)) - starts[row]
+            ys = spans[row, 1]
+        points.extend_arrays(xs, ys, self.color)
+        return points
+
+
+class CircleBatch(CurveBatchAlgorithm):
+    """Circles of integer `radii` around `centers`, each drawn like Circle."""
+
+    def __init__(self, centers, radii, color="green", filled=False):
+        super().__init__(centers, color, filled)
+        self.radii = np.broadcast_to(np.asarray(radii, dtype=np.int64), len(self.centers))
+
+    def _keys(self):
+        radii, inverse = np.unique(self.radii, return_inverse=True)
+        return [("circle", r) for r in radii.tolist()], inverse.reshape(-1)
+
+
+class EllipseBatch(CurveBatchAlgorithm):
+    """Axis-aligned ellipses with integer semi-axes (a, b) around `centers`, each drawn like Ellipse."""
+
+    def __init__(self, centers, axes, color="green", filled=False):
+        super().__init__(centers, color, filled)
+        self.axes = np.broadcast_to(np.asarray(axes, dtype=np.int64).reshape(-1, 2), (len(self.centers), 2))
+
+    def _keys(self):
+        axes, inverse = np.unique(self.axes, axis=0, return_inverse=True)
+        return [("ellipse", a, b) for a, b in axes.tolist()], inverse.reshape(-1)
+
+
+class FilledCircle(CurveAlgorithm):
+    def get_points(self):
+        radius = int(math.sqrt((self.x1 - self.x0) ** 2 + (self.y1 - self.y0) ** 2))
+        return CircleBatch([(self.x0, self.y0)], [radius], self.color, filled=True).get_points()
+
+
+class FilledEllipse(CurveAlgorithm):
+    def get_points(self):
+        axes = (abs(self.x1 - self.x0) // 2, abs(self.y1 - self.y0) // 2)
+        return EllipseBatch([(self.x0, self.y0)], [axes], self.color, filled=True).get_points()
@@ -0,0 +1,266 @@
+import random
+
+
+def super_triangle(points):
+    """The enclosing triangle the app has always used for Bowyer-Watson."""
+    min_x = min(p[0] for p in points)
+    min_y = min(p[1] for p in points)
+    max_x = max(p[0] for p in points)
+    max_y = max(p[1] for p in points)
+    delta_max = max(max_x - min_x, max_y - min_y, 1)
+    mid_x = (min_x + max_x) / 2
+    mid_y = (min_y + max_y) / 2
+    return ((mid_x - 2 * delta_max, mid_y - delta_max),
+            (mid_x, mid_y + 2 * delta_max),
+            (mid_x + 2 * delta_max, mid_y - delta_max))
+
+
+def _orient(a, b, c):
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def _circumcircle(a, b, c):
+    (ax, ay), (bx, by), (cx, cy) = a, b, c
+    d = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
+    if d == 0:
+        return None
+    ux = ((ax * ax + ay * ay) * (by - cy) +
+          (bx * bx + by * by) * (cy - ay) +
+          (cx * cx + cy * cy) * (ay - by)) / d
+    uy = ((ax * ax + ay * ay) * (cx - bx) +
+          (bx * bx + by * by) * (ax - cx) +
+          (cx * cx + cy * cy) * (bx - ax)) / d
+    return ux, uy, (ax - ux) ** 2 + (ay - uy) ** 2
+
+
+def _morton(x, y):
+    key = 0
+    for bit in range(16):
+        key |= ((x >> bit) & 1) << (2 * bit) | ((y >> bit) & 1) << (2 * bit + 1)
+    return key
+
+
+def insertion_order(points, seed=None):
+    """
+    Biased randomized insertion order: points are shuffled into rounds of doubling
+    size and every round is sorted along a Morton curve, so point location walks
+    stay short while the order is still random between rounds.
+    """
+    rng = random.Random(seed)
+    order = list(range(len(points)))
+    rng.shuffle(order)
+    if not points:
+        return order
+    min_x = min(p[0] for p in points)
+    min_y = min(p[1] for p in points)
+    span = max(max(p[0] for p in points) - min_x, max(p[1] for p in points) - min_y, 1)
+    scale = 0xFFFF / span
+
+    def key(i):
+        return _morton(int((points[i][0] - min_x) * scale), int((points[i][1] - min_y) * scale))
+
+    rounds = []
+    end = len(order)
+    while end > 0:
+        start = end // 2 if end > 64 else 0
+        rounds.append(sorted(order[start:end], key=key))
+        end = start
+    return [i for chunk in reversed(rounds) for i in chunk]
+
+
+class Delaunay:
+    """
+    Incremental Delaunay triangulation with Lawson edge flips.
+    Triangles are stored as counter-clockwise vertex triples with a parallel list of
+    neighbours (neighbour i lies across the edge opposite vertex i) and a lazily
+    cached circumcircle. Points are located by walking from the last created triangle.
+    The first three vertices form the enclosing triangle and are left out of `edges`.
+    """
+
+    def __init__(self, enclosing):
+        a, b, c = enclosing
+        if _orient(a, b, c) < 0:
+            b, c = c, b
+        self.vertices = [a, b, c]
+        self._index = {}
+        self._triangles = [[0, 1, 2]]
+        self._neighbours = [[-1, -1, -1]]
+        self._circles = [None]
+        self._last = 0
+        self._changed = []
+        self._replaced = {}
+        self._existing = 0
+
+    @classmethod
+    def from_points(cls, points, seed=None):
+        points = [tuple(p) for p in points]
+        triangulation = cls(super_triangle(points))
+        for i in insertion_order(points, seed):
+            triangulation.insert(points[i])
+        return triangulation
+
+    def insert(self, point):
+        """
+        Adds a point and returns the (removed, added) edge sets, or None if the point is
+        a duplicate or lies outside the enclosing triangle.
+        """
+        point = tuple(point)
+        if point in self._index:
+            return None
+        t, edge = self._locate(point)
+        if t is None:
+            return None
+        p = len(self.vertices)
+        self.vertices.append(point)
+        self._index[point] = p
+        self._changed = []
+        self._replaced = {}
+        self._existing = len(self._triangles)
+        if edge is None:
+            stack = self._split_triangle(t, p)
+        else:
+            stack = self._split_edge(t, edge, p)
+        self._legalize(stack, p)
+        old = set()
+        for edges in self._replaced.values():
+            old.update(edges)
+        new = set()
+        for t in set(self._changed):
+            new.update(self.triangle_edges(t))
+        return old - new, new - old
+
+    def edges(self):
+        result = set()
+        for t in range(len(self._triangles)):
+            result.update(self.triangle_edges(t))
+        return result
+
+    def triangle_edges(self, t):
+        """Edges of triangle t as sorted point pairs, skipping the enclosing vertices."""
+        tri = self._triangles[t]
+        result = []
+        for i in range(3):
+            a, b = tri[i], tri[(i + 1) % 3]
+            if a > 2 and b > 2:
+                result.append(tuple(sorted((self.vertices[a], self.vertices[b]))))
+        return result
+
+    def triangles(self):
+        return [tuple(self.vertices[v] for v in tri) for tri in self._triangles if min(tri) > 2]
+
+    def contains(self, point):
+        """True if the point lies inside the enclosing triangle."""
+        a, b, c = self.vertices[:3]
+        return _orient(a, b, point) > 0 and _orient(b, c, point) > 0 and _orient(c, a, point) > 0
+
+    def _locate(self, point):
+        if not self.contains(point):
+            return None, None
+        t = min(self._last, len(self._triangles) - 1)
+        start = 0
+        for _ in range(4 * len(self._triangles) + 3):
+            tri = self._triangles[t]
+            zero = None
+            for k in range(3):
+                i = (start + k) % 3
+                side = _orient(self.vertices[tri[(i + 1) % 3]], self.vertices[tri[(i + 2) % 3]], point)
+                if side < 0:
+                    t = self._neighbours[t][i]
+                    start = (start + 1) % 3
+                    break
+                if side == 0:
+                    zero = i
+            else:
+                return t, zero
+        raise RuntimeError("Point location did not converge")
+
+    def _set(self, t, tri, neighbours):
+        if t == len(self._triangles):
+            self._triangles.append(tri)
+            self._neighbours.append(neighbours)
+            self._circles.append(None)
+        else:
+            if t < self._existing and t not in self._replaced:
+                self._replaced[t] = self.triangle_edges(t)
+            self._triangles[t] = tri
+            self._neighbours[t] = neighbours
+            self._circles[t] = None
+        self._changed.append(t)
+        self._last = t
+
+    def _circle(self, t):
+        circle = self._circles[t]
+        if circle is None:
+            v = self.vertices
+            a, b, c = self._triangles[t]
+            circle = self._circles[t] = _circumcircle(v[a], v[b], v[c]) or (0.0, 0.0, -1.0)
+        return circle
+
+    def _relink(self, t, old, new):
+        if t != -1:
+            neighbours = self._neighbours[t]
+            neighbours[neighbours.index(old)] = new
+
+    def _split_triangle(self, t, p):
+        v0, v1, v2 = self._triangles[t]
+        n0, n1, n2 = self._neighbours[t]
+        t1 = len(self._triangles)
+        t2 = t1 + 1
+        self._set(t, [p, v1, v2], [n0, t1, t2])
+        self._set(t1, [v0, p, v2], [t, n1, t2])
+        self._set(t2, [v0, v1, p], [t, t1, n2])
+        self._relink(n1, t, t1)
+        self._relink(n2, t, t2)
+        return [(t, 0), (t1, 1), (t2, 2)]
+
+    def _split_edge(self, t, i, p):
+        tri, nbr = self._triangles[t], self._neighbours[t]
+        a, b, c = tri[i], tri[(i + 1) % 3], tri[(i + 2) % 3]
+        t_ab, t_ca = nbr[(i + 2) % 3], nbr[(i + 1) % 3]
+        u = nbr[i]
+        if u == -1:
+            t1 = len(self._triangles)
+            self._set(t, [a, b, p], [-1, t1, t_ab])
+            self._set(t1, [a, p, c], [-1, t_ca, t])
+            self._relink(t_ca, t, t1)
+            return [(t, 2), (t1, 1)]
+        j = self._neighbours[u].index(t)
+        d = self._triangles[u][j]
+        u_nbr = self._neighbours[u]
+        u_dc, u_bd = u_nbr[(j + 2) % 3], u_nbr[(j + 1) % 3]
+        t1 = len(self._triangles)
+        u1 = t1 + 1
+        self._set(t, [a, b, p], [u1, t1, t_ab])
+        self._set(t1, [a, p, c], [u, t_ca, t])
+        self._set(u, [d, c, p], [t1, u1, u_dc])
+        self._set(u1, [d, p, b], [t, u_bd, u])
+        self._relink(t_ca, t, t1)
+        self._relink(u_bd, u, u1)
+        return [(t, 2), (t1, 1), (u, 2), (u1, 1)]
+
+    def _legalize(self, stack, p):
+        vertices = self.vertices
+        while stack:
+            t, i = stack.pop()
+            u = self._neighbours[t][i]
+            if u == -1:
+                continue
+            j = self._neighbours[u].index(t)
+            d = self._triangles[u][j]
+            ux, uy, r2 = self._circle(t)
+            dx, dy = vertices[d]
+            if (dx - ux) ** 2 + (dy - uy) ** 2 >= r2 * (1 - 1e-12):
+                continue
+            tri, nbr = self._triangles[t], self._neighbours[t]
+            b, c = tri[(i + 1) % 3], tri[(i + 2) % 3]
+            t_cp, t_pb = nbr[(i + 1) % 3], nbr[(i + 2) % 3]
+            u_nbr = self._neighbours[u]
+            u_bd, u_dc = u_nbr[(j + 1) % 3], u_nbr[(j + 2) % 3]
+            if self._triangles[u][(j + 1) % 3] != c:
+                u_bd, u_dc = u_dc, u_bd
+            self._set(t, [p, b, d], [u_bd, u, t_pb])
+            self._set(u, [p, d, c], [u_dc, t_cp, t])
+            self._relink(u_bd, u, t)
+            self._relink(t_cp, t, u)
+            stack.append((t, 0))
+            stack.append((u, 0))
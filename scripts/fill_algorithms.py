@@ -1,4 +1,7 @@
-from scripts.point_check import is_point_inside, is_on_boundary
+import math
+from bisect import bisect_left, insort
+
+from scripts.point_check import is_point_inside, point_on_segment, PreparedPolygon
 
 
 class FillAlgorithm:
@@ -9,14 +12,31 @@ class FillAlgorithm:
         self._fill_algorithm_state = {}
 
 
-class ET(FillAlgorithm):
-    def get_points(self):
-        points = []
+class _Edge:
+    __slots__ = ("y_max", "x", "slope")
 
-        et = {}
-        for i in range(len(self._points)):
-            p1 = self._points[i]
-            p2 = self._points[(i + 1) % len(self._points)]
+    def __init__(self, y_max, x, slope):
+        self.y_max = y_max
+        self.x = x
+        self.slope = slope
+
+
+def _edge_x(edge):
+    return edge.x
+
+
+class EdgeTable:
+    """
+    Edge table shared by ET and AEL. Edges are slot records bucketed by their first
+    scanline. The active edge list stays sorted by x: entering edges are merged in by
+    bisection and the list is only re-sorted on rows where two edges crossed.
+    """
+
+    def __init__(self, points):
+        self._buckets = {}
+        for i in range(len(points)):
+            p1 = points[i]
+            p2 = points[(i + 1) % len(points)]
 
             if p1[1] == p2[1]:
                 continue
@@ -24,126 +44,80 @@ class ET(FillAlgorithm):
             if p1[1] > p2[1]:
                 p1, p2 = p2, p1
 
-            y_min = int(p1[1])
-            y_max = int(p2[1])
-            x = p1[0]
-            dx = p2[0] - p1[0]
-            dy = p2[1] - p1[1]
-
-            if dy == 0:
-                continue
+            edge = _Edge(int(p2[1]), p1[0], (p2[0] - p1[0]) / (p2[1] - p1[1]))
+            self._buckets.setdefault(int(p1[1]), []).append(edge)
 
-            slope = dx / dy
+    def __bool__(self):
+        return bool(self._buckets)
 
-            if y_min not in et:
-                et[y_min] = []
-            et[y_min].append({
-                'y_max': y_max,
-                'x': x,
-                'dx': dx,
-                'dy': dy,
-                'slope': slope
-            })
-
-        if not et:
+    def scanlines(self):
+        """Yields (y, active edges sorted by x) for every scanline; the list is reused."""
+        buckets = dict(self._buckets)
+        if not buckets:
             return
 
         ael = []
-        current_y = min(et.keys())
+        current_y = min(buckets)
 
         while True:
-            if current_y in et:
-                for edge in et[current_y]:
-                    ael.append(edge)
-                del et[current_y]
-
-            ael.sort(key=lambda e: e['x'])
-            i = 0
-            while i < len(ael):
-                e1 = ael[i]
-                if i + 1 >= len(ael):
-                    break
-
-                e2 = ael[i + 1]
-                x_start = int(e1['x'])
-                x_end = int(e2['x'])
+            entering = buckets.pop(current_y, None)
+            if entering:
+                for edge in entering:
+                    insort(ael, edge, key=_edge_x)
 
-                if x_start > x_end:
-                    x_start, x_end = x_end, x_start
-
-                points.append((x_start, current_y, x_end, current_y))
-                i += 2
+            yield current_y, ael
 
             current_y += 1
-            ael = [e for e in ael if e['y_max'] > current_y]
-
+            kept = 0
+            previous = -math.inf
+            ordered = True
             for edge in ael:
-                edge['x'] += edge['slope']
-
-            if not ael and not et:
+                if edge.y_max > current_y:
+                    edge.x += edge.slope
+                    if edge.x < previous:
+                        ordered = False
+                    previous = edge.x
+                    ael[kept] = edge
+                    kept += 1
+            del ael[kept:]
+            if not ordered:
+                ael.sort(key=_edge_x)
+
+            if not ael and not buckets:
                 break
 
-        return points
-
 
-class AEL(FillAlgorithm):
+class ET(FillAlgorithm):
     def get_points(self):
         points = []
 
-        et = {}
-        for i in range(len(self._points)):
-            p1 = self._points[i]
-            p2 = self._points[(i + 1) % len(self._points)]
+        table = EdgeTable(self._points)
+        if not table:
+            return
 
-            if p1[1] == p2[1]:
-                continue
+        for current_y, ael in table.scanlines():
+            for i in range(0, len(ael) - 1, 2):
+                x_start = int(ael[i].x)
+                x_end = int(ael[i + 1].x)
 
-            if p1[1] > p2[1]:
-                p1, p2 = p2, p1
+                if x_start > x_end:
+                    x_start, x_end = x_end, x_start
 
-            y_min = int(p1[1])
-            y_max = int(p2[1])
-            x = p1[0]
-            dx = p2[0] - p1[0]
-            dy = p2[1] - p1[1]
-            slope = dx / dy
+                points.append((x_start, current_y, x_end, current_y))
 
-            if y_min not in et:
-                et[y_min] = []
-            et[y_min].append({'y_max': y_max, 'x': x, 'slope': slope})
+        return points
 
-        ael = []
-        current_y = min(et.keys()) if et else 0
 
-        while True:
-            if current_y in et:
-                ael.extend(et[current_y])
-                del et[current_y]
-
-            ael.sort(key=lambda e: e['x'])
-
-            i = 0
-            while i < len(ael):
-                if i + 1 >= len(ael):
-                    break
-                e1 = ael[i]
-                e2 = ael[i + 1]
-                x_start = int(e1['x'])
-                x_end = int(e2['x'])
+class AEL(FillAlgorithm):
+    def get_points(self):
+        points = []
+
+        for current_y, ael in EdgeTable(self._points).scanlines():
+            for i in range(0, len(ael) - 1, 2):
+                x_start = int(ael[i].x)
+                x_end = int(ael[i + 1].x)
                 if x_start < x_end:
                     points.append((x_start, current_y, x_end, current_y))
-                i += 2
-
-            current_y += 1
-            new_ael = []
-            for edge in ael:
-                if edge['y_max'] > current_y:
-                    edge['x'] += edge['slope']
-                    new_ael.append(edge)
-            ael = new_ael
-
-            if not ael and not et:
-                break
 
         return points
 
@@ -152,6 +126,7 @@ class Flood(FillAlgorithm):
     def get_points(self):
         points = []
 
+        polygon = PreparedPolygon(self._points)
         stack = [(self._start_x, self._start_y)]
         filled = set()
 
@@ -159,7 +134,7 @@ class Flood(FillAlgorithm):
             x, y = stack.pop()
             if (x, y) in filled:
                 continue
-            if not is_point_inside(self._points, x, y) or is_on_boundary(self._points, x, y):
+            if not polygon.is_point_inside(x, y) or polygon.is_on_boundary(x, y):
                 continue
 
             points.append((x, y, x + 1, y + 1))
@@ -173,6 +148,80 @@ class Flood(FillAlgorithm):
         return points
 
 
+class ScanlineFlood(FillAlgorithm):
+    """
+    Seed fill that expands whole horizontal spans instead of single pixels.
+    The fillable runs of a scanline (inside the polygon and off its boundary, the
+    same test Flood applies per pixel) are computed once per row from the edge
+    crossings, and the flood walks from run to run. Emits (x_start, y, x_end, y)
+    spans covering the same pixels as Flood.
+    """
+
+    def get_points(self):
+        points = []
+        if len(self._points) < 3:
+            return points
+
+        rows = {}
+        seed = None
+        for run in self._row_runs(self._start_y, rows):
+            if run[0] <= self._start_x <= run[1]:
+                seed = run
+        if seed is None:
+            return points
+
+        stack = [(self._start_y, seed)]
+        visited = {(self._start_y, seed[0])}
+        while stack:
+            y, (x_start, x_end) = stack.pop()
+            points.append((x_start, y, x_end, y))
+            for next_y in (y - 1, y + 1):
+                for run in self._row_runs(next_y, rows):
+                    if run[0] <= x_end and run[1] >= x_start and (next_y, run[0]) not in visited:
+                        visited.add((next_y, run[0]))
+                        stack.append((next_y, run))
+
+        return points
+
+    def _row_runs(self, y, rows):
+        if y in rows:
+            return rows[y]
+
+        crossings = []
+        boundary = set()
+        n = len(self._points)
+        for i in range(n):
+            p1 = self._points[i]
+            p2 = self._points[(i + 1) % n]
+            if (p1[1] > y) != (p2[1] > y):
+                crossings.append(((y - p1[1]) * (p2[0] - p1[0])) / (p2[1] - p1[1]) + p1[0])
+            if min(p1[1], p2[1]) - 1e-8 <= y <= max(p1[1], p2[1]) + 1e-8:
+                if p1[1] == p2[1]:
+                    candidates = range(math.ceil(min(p1[0], p2[0]) - 1e-8), math.floor(max(p1[0], p2[0]) + 1e-8) + 1)
+                else:
+                    candidates = (round(p1[0] + (y - p1[1]) * (p2[0] - p1[0]) / (p2[1] - p1[1])),)
+                for x in candidates:
+                    if point_on_segment((x, y), p1, p2):
+                        boundary.add(x)
+        crossings.sort()
+
+        # A pixel off the boundary is inside when an odd number of crossings lie left
+        # of it, i.e. crossings[2k] < x <= crossings[2k + 1]; boundary pixels split the runs and
+        # touching runs of consecutive pairs merge.
+        runs = []
+        for k in range(0, len(crossings) - 1, 2):
+            start = math.floor(crossings[k]) + 1
+            last = math.floor(crossings[k + 1])
+            for cut in sorted(b for b in boundary if start <= b <= last) + [last + 1]:
+                if start < cut and runs and runs[-1][1] == start - 1:
+                    runs[-1] = (runs[-1][0], cut - 1)
+                elif start < cut:
+                    runs.append((start, cut - 1))
+                start = cut + 1
+        rows[y] = runs
+        return runs
+
+
 class LBL(FillAlgorithm):
     def get_points(self):
         points = []
@@ -200,3 +249,102 @@ class LBL(FillAlgorithm):
                         points.append((x, current_y, x + 1, current_y + 1))
 
         return points
+
+
+class SpanLBL(FillAlgorithm):
+    """
+    Line-by-line fill that emits one (x_start, y, x_end, y) span per inside interval
+    instead of testing every pixel. Edges enter and leave the active list by their y
+    range and advance by an integer numerator (x = num / dy + x1, num += dx), so with
+    integer vertices the crossings equal LBL's exactly. `rule` is "even-odd" (the
+    pixels of LBL) or "nonzero". Only the end pixels of an interval need a test.
+    """
+
+    def __init__(self, points, x, y, rule="even-odd"):
+        super().__init__(points, x, y)
+        self._rule = rule
+
+    def get_points(self):
+        points = []
+        if not self._points:
+            return points
+
+        edges = []
+        n = len(self._points)
+        for i in range(n):
+            p1 = self._points[i]
+            p2 = self._points[(i + 1) % n]
+            edges.append((min(p1[1], p2[1]), max(p1[1], p2[1]), p1, p2))
+        edges.sort(key=lambda e: e[0])
+
+        active = []
+        touching = []
+        entered = 0
+        reached = 0
+        min_y = edges[0][0]
+        max_y = max(e[1] for e in edges)
+
+        for current_y in range(int(min_y), int(max_y) + 1):
+            while entered < n and edges[entered][0] <= current_y:
+                y_min, y_max, p1, p2 = edges[entered]
+                entered += 1
+                if y_min < y_max:
+                    dx = p2[0] - p1[0]
+                    dy = p2[1] - p1[1]
+                    active.append([y_max, p1[0], dx, dy, (current_y - p1[1]) * dx, 1 if dy > 0 else -1])
+            active = [e for e in active if e[0] > current_y]
+            while reached < n and edges[reached][0] - 1e-8 <= current_y:
+                touching.append(edges[reached])
+                reached += 1
+            touching = [e for e in touching if e[1] + 1e-8 >= current_y]
+
+            crossings = []
+            for edge in active:
+                crossings.append((edge[4] / edge[3] + edge[1], edge[5]))
+                edge[4] += edge[2]
+            crossings.sort()
+            xs = [c[0] for c in crossings]
+
+            if self._rule == "nonzero":
+                winding = [0]
+                for _, direction in crossings:
+                    winding.append(winding[-1] + direction)
+            else:
+                winding = [k % 2 for k in range(len(crossings) + 1)]
+
+            last = None
+            k = 0
+            while k < len(xs) - 1:
+                if not winding[k + 1]:
+                    k += 1
+                    continue
+                start = k
+                while k < len(xs) - 1 and winding[k + 1]:
+                    k += 1
+                lo, hi = xs[start], xs[k]
+
+                x_start, x_end = int(lo), int(hi)
+                inner_start = max(x_start, math.floor(lo) + 1)
+                inner_end = min(x_end, math.floor(hi))
+                if last is not None:
+                    x_start = max(x_start, last + 1)
+                    inner_start = max(inner_start, last + 1)
+                for x in range(x_start, min(inner_start, x_end + 1)):
+                    if self._inside(x, current_y, xs, winding, touching):
+                        break
+                    x_start = x + 1
+                for x in range(x_end, max(inner_end, x_start - 1), -1):
+                    if self._inside(x, current_y, xs, winding, touching):
+                        break
+                    x_end = x - 1
+                if x_start <= x_end:
+                    points.append((x_start, current_y, x_end, current_y))
+                    last = x_end
+
+        return points
+
+    @staticmethod
+    def _inside(x, y, xs, winding, touching):
+        if winding[bisect_left(xs, x)]:
+            return True
+        return any(point_on_segment((x, y), p1, p2) for _, _, p1, p2 in touching)
@@ -0,0 +1,253 @@
+import heapq
+import math
+
+import numpy as np
+
+_CIRCLE = 0
+_SITE = 1
+
+
+class _Arc:
+    __slots__ = ("site", "event")
+
+    def __init__(self, site):
+        self.site = site
+        self.event = None
+
+
+class _CircleEvent:
+    __slots__ = ("arc", "center", "valid")
+
+    def __init__(self, arc, center):
+        self.arc = arc
+        self.center = center
+        self.valid = True
+
+
+class _Edge:
+    """
+    Voronoi edge between two sites. Each end is either a finished vertex or still
+    open, in which case it runs from `start` to infinity along its direction.
+    """
+    __slots__ = ("left", "right", "start", "points", "directions")
+
+    def __init__(self, left, right, start, directions):
+        self.left = left
+        self.right = right
+        self.start = start
+        self.points = [None, None]
+        self.directions = directions
+
+
+class FortuneVoronoi:
+    """
+    Vector Voronoi diagram by Fortune's sweep line.
+    The sweep moves towards increasing y. The beach line is a list of arcs ordered
+    left to right, searched by bisection over breakpoints evaluated at the current
+    sweep position; circle events are lazily invalidated entries of a heap. Finding
+    an arc is O(log n), but inserting and removing arcs shifts the lists, so an event
+    costs O(n) and the worst case is O(n^2) rather than the O(n log n) of a tree.
+    `edges` holds (site_i, site_j, (x1, y1), (x2, y2)) clipped to `bounds`, given as
+    (min_x, min_y, max_x, max_y), and `vertices` the diagram vertices inside them.
+    """
+
+    def __init__(self, sites, bounds):
+        self.bounds = bounds
+        self._sites = []
+        self._ids = []
+        seen = set()
+        for i, (x, y) in enumerate(sites):
+            key = (float(x), float(y))
+            if key not in seen:
+                seen.add(key)
+                self._sites.append(key)
+                self._ids.append(i)
+        self._arcs = []
+        self._breaks = []
+        self._edges = []
+        self._vertices = []
+        self._events = [(y, x, _SITE, i, i) for i, (x, y) in enumerate(self._sites)]
+        heapq.heapify(self._events)
+        self._counter = len(self._sites)
+        self._sweep = None
+        self._run()
+        self.edges = self._clip_edges()
+        min_x, min_y, max_x, max_y = bounds
+        self.vertices = [v for v in self._vertices if min_x <= v[0] <= max_x and min_y <= v[1] <= max_y]
+
+    def _run(self):
+        while self._events:
+            y, _, kind, _, payload = heapq.heappop(self._events)
+            self._sweep = y
+            if kind == _SITE:
+                self._site_event(payload)
+            elif payload.valid:
+                self._circle_event(payload)
+
+    def _breakpoint(self, k):
+        (a1, b1), (a2, b2) = self._sites[self._arcs[k].site], self._sites[self._arcs[k + 1].site]
+        sweep = self._sweep
+        if b1 == b2:
+            return (a1 + a2) / 2
+        if b1 == sweep:
+            return a1
+        if b2 == sweep:
+            return a2
+        d1 = 1 / (2 * (b1 - sweep))
+        d2 = 1 / (2 * (b2 - sweep))
+        a = d1 - d2
+        b = -2 * (a1 * d1 - a2 * d2)
+        c = d1 * (a1 * a1 + b1 * b1 - sweep * sweep) - d2 * (a2 * a2 + b2 * b2 - sweep * sweep)
+        root = math.sqrt(max(b * b - 4 * a * c, 0.0))
+        x1 = (-b - root) / (2 * a)
+        x2 = (-b + root) / (2 * a)
+        low, high = min(x1, x2), max(x1, x2)
+        return high if b1 > b2 else low
+
+    def _locate(self, x):
+        lo, hi = 0, len(self._breaks)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._breakpoint(mid) < x:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _direction(self, left, right):
+        (x1, y1), (x2, y2) = self._sites[left], self._sites[right]
+        return y1 - y2, x2 - x1
+
+    def _site_event(self, i):
+        x, y = self._sites[i]
+        if not self._arcs:
+            self._arcs.append(_Arc(i))
+            return
+        k = self._locate(x)
+        arc = self._arcs[k]
+        j = arc.site
+        self._invalidate(arc)
+        jx, jy = self._sites[j]
+        if jy == y:
+            # Sites on the first sweep position: their arcs are vertical rays and
+            # arrive left to right, so the new arc goes after the last one.
+            edge = _Edge(j, i, ((jx + x) / 2, y), [(0.0, -1.0), self._direction(j, i)])
+            self._edges.append(edge)
+            self._arcs.insert(k + 1, _Arc(i))
+            self._breaks.insert(k, (edge, 1))
+            return
+        start = (x, ((x - jx) ** 2 + jy * jy - y * y) / (2 * (jy - y)))
+        edge = _Edge(j, i, start, [self._direction(j, i), self._direction(i, j)])
+        self._edges.append(edge)
+        self._arcs[k + 1:k + 1] = [_Arc(i), _Arc(j)]
+        self._breaks[k:k] = [(edge, 0), (edge, 1)]
+        self._check_circle(k)
+        self._check_circle(k + 2)
+
+    def _circle_event(self, event):
+        center = event.center
+        k = self._find(event.arc, center[0])
+        left, right = self._arcs[k - 1], self._arcs[k + 1]
+        self._invalidate(left)
+        self._invalidate(right)
+        self._vertices.append(center)
+        for edge, end in (self._breaks[k - 1], self._breaks[k]):
+            edge.points[end] = center
+        edge = _Edge(left.site, right.site, center, [None, self._direction(left.site, right.site)])
+        edge.points[0] = center
+        self._edges.append(edge)
+        del self._arcs[k]
+        self._breaks[k - 1:k + 1] = [(edge, 1)]
+        self._check_circle(k - 1)
+        self._check_circle(k)
+
+    def _find(self, arc, x):
+        k = min(self._locate(x), len(self._arcs) - 1)
+        for offset in range(4):
+            for candidate in (k - offset, k + offset):
+                if 0 <= candidate < len(self._arcs) and self._arcs[candidate] is arc:
+                    return candidate
+        return self._arcs.index(arc)
+
+    def _invalidate(self, arc):
+        if arc.event is not None:
+            arc.event.valid = False
+            arc.event = None
+
+    def _check_circle(self, k):
+        if k - 1 < 0 or k + 1 >= len(self._arcs):
+            return
+        a, b, c = (self._sites[self._arcs[i].site] for i in (k - 1, k, k + 1))
+        if self._arcs[k - 1].site == self._arcs[k + 1].site:
+            return
+        if (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0]) <= 0:
+            return
+        d = 2 * (a[0] * (b[1] - c[1]) + b[0] * (c[1] - a[1]) + c[0] * (a[1] - b[1]))
+        if d == 0:
+            return
+        ux = ((a[0] ** 2 + a[1] ** 2) * (b[1] - c[1]) + (b[0] ** 2 + b[1] ** 2) * (c[1] - a[1]) +
+              (c[0] ** 2 + c[1] ** 2) * (a[1] - b[1])) / d
+        uy = ((a[0] ** 2 + a[1] ** 2) * (c[0] - b[0]) + (b[0] ** 2 + b[1] ** 2) * (a[0] - c[0]) +
+              (c[0] ** 2 + c[1] ** 2) * (b[0] - a[0])) / d
+        bottom = uy + math.hypot(a[0] - ux, a[1] - uy)
+        if bottom < self._sweep - 1e-9 * max(1.0, abs(bottom)):
+            return
+        event = _CircleEvent(self._arcs[k], (ux, uy))
+        self._arcs[k].event = event
+        self._counter += 1
+        heapq.heappush(self._events, (bottom, ux, _CIRCLE, self._counter, event))
+
+    def _clip_edges(self):
+        result = []
+        for edge in self._edges:
+            ends = edge.points
+            if ends[0] is not None and ends[1] is not None:
+                pieces = [(ends[0], (ends[1][0] - ends[0][0], ends[1][1] - ends[0][1]), 1.0)]
+            elif ends[0] is not None or ends[1] is not None:
+                k = 0 if ends[0] is not None else 1
+                pieces = [(ends[k], edge.directions[1 - k], math.inf)]
+            else:
+                pieces = [(edge.start, direction, math.inf) for direction in edge.directions]
+            for origin, direction, limit in pieces:
+                segment = self._clip(origin, direction, limit)
+                if segment is not None:
+                    result.append((self._ids[edge.left], self._ids[edge.right], *segment))
+        return result
+
+    def _clip(self, origin, direction, limit):
+        """Liang-Barsky clipping of origin + t * direction, 0 <= t <= limit."""
+        min_x, min_y, max_x, max_y = self.bounds
+        t0, t1 = 0.0, limit
+        for p, q in ((-direction[0], origin[0] - min_x), (direction[0], max_x - origin[0]),
+                     (-direction[1], origin[1] - min_y), (direction[1], max_y - origin[1])):
+            if p == 0:
+                if q < 0:
+                    return None
+                continue
+            t = q / p
+            if p < 0:
+                t0 = max(t0, t)
+            else:
+                t1 = min(t1, t)
+            if t0 > t1:
+                return None
+        if math.isinf(t1):
+            return None
+        return ((origin[0] + t0 * direction[0], origin[1] + t0 * direction[1]),
+                (origin[0] + t1 * direction[0], origin[1] + t1 * direction[1]))
+
+
+def cross_check(diagram, labels):
+    """
+    Compares a FortuneVoronoi diagram with a raster label image of the same sites.
+    Returns the site pairs whose cells touch in the raster but share no vector edge;
+    on general input only pairs meeting near a vertex can show up here.
+    """
+    pairs = set()
+    for a, b in ((labels[:, :-1], labels[:, 1:]), (labels[:-1, :], labels[1:, :])):
+        differ = a != b
+        low = np.minimum(a[differ], b[differ])
+        high = np.maximum(a[differ], b[differ])
+        pairs.update(zip(low.tolist(), high.tolist()))
+    edges = {(min(i, j), max(i, j)) for i, j, _, _ in diagram.edges}
+    return pairs - edges
@@ -0,0 +1,146 @@
+import tkinter as tk
+
+import numpy as np
+
+from scripts.pixel_buffer import PixelBuffer
+
+
+class Framebuffer:
+    """
+    In-memory RGB raster with one entry per grid cell.
+    Algorithm output is written with `draw` in bulk and `to_ppm` returns the whole
+    picture scaled by `scale`, ready to be shown as a single Tk PhotoImage. With a
+    scale above 2 the grid lines and the black cell outlines of the canvas renderer
+    are baked into the image.
+    """
+
+    def __init__(self, width, height, scale=1, background=(255, 255, 255),
+                 grid=(211, 211, 211), outline=(0, 0, 0)):
+        self.scale = scale
+        self.background = np.array(background, dtype=np.uint8)
+        self.grid = None if grid is None else np.array(grid, dtype=np.uint8)
+        self.outline = None if outline is None else np.array(outline, dtype=np.uint8)
+        self.pixels = np.empty((height, width, 3), dtype=np.uint8)
+        self.painted = np.zeros((height, width), dtype=bool)
+        self._rgb_cache = {}
+        self.clear()
+
+    @property
+    def width(self):
+        return self.pixels.shape[1]
+
+    @property
+    def height(self):
+        return self.pixels.shape[0]
+
+    def clear(self):
+        self.pixels[:] = self.background
+        self.painted[:] = False
+
+    def resize(self, width, height):
+        if (width, height) == (self.width, self.height):
+            return
+        pixels = np.empty((height, width, 3), dtype=np.uint8)
+        pixels[:] = self.background
+        painted = np.zeros((height, width), dtype=bool)
+        h, w = min(height, self.height), min(width, self.width)
+        pixels[:h, :w] = self.pixels[:h, :w]
+        painted[:h, :w] = self.painted[:h, :w]
+        self.pixels, self.painted = pixels, painted
+
+    def resolve_palette(self, palette, resolve_color):
+        rgb = np.empty((len(palette), 3), dtype=np.uint8)
+        for i, color in enumerate(palette):
+            if color not in self._rgb_cache:
+                self._rgb_cache[color] = resolve_color(color)
+            rgb[i] = self._rgb_cache[color]
+        return rgb
+
+    def draw(self, points, resolve_color):
+        """Writes a PixelBuffer (or any iterable of (x, y, color)) into the raster."""
+        if not isinstance(points, PixelBuffer):
+            buffer = PixelBuffer()
+            buffer.extend(points)
+            points = buffer
+        xs, ys, index = points.as_arrays()
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        rgb = self.resolve_palette(points.palette, resolve_color)
+        self.pixels[ys[inside], xs[inside]] = rgb[index[inside]]
+        self.painted[ys[inside], xs[inside]] = True
+
+    def draw_labels(self, labels, rgb):
+        """Blits a label image, coloring every label with the matching row of `rgb`."""
+        height = min(labels.shape[0], self.height)
+        width = min(labels.shape[1], self.width)
+        self.pixels[:height, :width] = rgb[labels[:height, :width]]
+        self.painted[:height, :width] = True
+
+    def to_ppm(self):
+        s = self.scale
+        image = self.pixels
+        if s > 1:
+            image = np.repeat(np.repeat(image, s, axis=0), s, axis=1)
+        if s > 2:
+            if self.grid is not None:
+                image[::s, :] = self.grid
+                image[:, ::s] = self.grid
+            if self.outline is not None:
+                # A cell outline sits on its own left/top line and on the line shared
+                # with the right/bottom neighbour, like the canvas rectangles.
+                left = self.painted.copy()
+                left[:, 1:] |= self.painted[:, :-1]
+                top = self.painted.copy()
+                top[1:, :] |= self.painted[:-1, :]
+                image[:, ::s][np.repeat(left, s, axis=0)] = self.outline
+                image[::s, :][np.repeat(top, s, axis=1)] = self.outline
+        height, width = image.shape[:2]
+        return f"P6 {width} {height} 255\n".encode() + image.tobytes()
+
+
+class FramebufferView:
+    """Keeps a Framebuffer sized to a Tk canvas and shows it as a single image item."""
+
+    def __init__(self, canvas, scale=1, tag="framebuffer", **options):
+        self._canvas = canvas
+        self._tag = tag
+        self._options = options
+        self.scale = scale
+        self.framebuffer = None
+        self._image = None
+
+    def draw(self, points):
+        self._fit()
+        self.framebuffer.draw(points, self._color_to_rgb)
+        self.refresh()
+
+    def draw_labels(self, labels, rgb):
+        self._fit()
+        self.framebuffer.draw_labels(labels, rgb)
+        self.refresh()
+
+    def clear(self):
+        self._canvas.delete(self._tag)
+        if self.framebuffer is not None:
+            self.framebuffer.clear()
+
+    def refresh(self):
+        data = self.framebuffer.to_ppm()
+        if self._image is None:
+            self._image = tk.PhotoImage(data=data, format="PPM")
+        else:
+            self._image.configure(data=data, format="PPM")
+        if not self._canvas.find_withtag(self._tag):
+            self._canvas.create_image(0, 0, image=self._image, anchor=tk.NW, tags=self._tag)
+            self._canvas.tag_lower(self._tag)
+            self._canvas.tag_lower("grid")
+
+    def _fit(self):
+        width = self._canvas.winfo_width() // self.scale + 1
+        height = self._canvas.winfo_height() // self.scale + 1
+        if self.framebuffer is None or self.framebuffer.scale != self.scale:
+            self.framebuffer = Framebuffer(width, height, scale=self.scale, **self._options)
+        else:
+            self.framebuffer.resize(width, height)
+
+    def _color_to_rgb(self, color):
+        return tuple(channel >> 8 for channel in self._canvas.winfo_rgb(color))
@@ -0,0 +1,54 @@
+import tkinter as tk
+
+
+class GridBackground:
+    """
+    Shows the cell grid of a canvas as a single image item.
+    The image is built once per grid size by tiling one cell over the screen area, so
+    resizing the canvas never adds items. <Configure> events passed to `schedule` are
+    coalesced and handled once the size has settled for `delay` milliseconds.
+    """
+
+    def __init__(self, canvas, grid_size, color="lightgray", delay=100, tag="grid"):
+        self._canvas = canvas
+        self._color = color
+        self._delay = delay
+        self._tag = tag
+        self._images = {}
+        self._pending = None
+        self.grid_size = grid_size
+
+    def draw(self):
+        image = self._image()
+        if not self._canvas.find_withtag(self._tag):
+            self._canvas.create_image(0, 0, image=image, anchor=tk.NW, tags=self._tag)
+        else:
+            self._canvas.itemconfigure(self._tag, image=image)
+        self._canvas.tag_lower(self._tag)
+
+    def schedule(self, event=None):
+        if self._pending is not None:
+            self._canvas.after_cancel(self._pending)
+        self._pending = self._canvas.after(self._delay, self._settled)
+
+    def _settled(self):
+        self._pending = None
+        self.draw()
+
+    def _image(self):
+        width = max(self._canvas.winfo_screenwidth(), self._canvas.winfo_width())
+        height = max(self._canvas.winfo_screenheight(), self._canvas.winfo_height())
+        image = self._images.get(self.grid_size)
+        if image is not None and image.width() >= width and image.height() >= height:
+            return image
+
+        size = self.grid_size
+        tile = tk.PhotoImage(master=self._canvas, width=size, height=size)
+        tile.put("white", to=(0, 0, size, size))
+        tile.put(self._color, to=(0, 0, size, 1))
+        tile.put(self._color, to=(0, 0, 1, size))
+        image = tk.PhotoImage(master=self._canvas, width=width, height=height)
+        # "copy -to" repeats the source across the target region.
+        image.tk.call(image, "copy", tile, "-to", 0, 0, width, height)
+        self._images[size] = image
+        return image
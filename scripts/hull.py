@@ -0,0 +1,189 @@
+from bisect import bisect_left
+from collections import Counter
+
+import numpy as np
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _graham_chain(points):
+    chain = []
+    for p in points:
+        while len(chain) >= 2 and _cross(chain[-2], chain[-1], p) <= 0:
+            chain.pop()
+        chain.append(p)
+    return chain
+
+
+def _sorted_unique(points):
+    points = np.asarray(points)
+    if not np.issubdtype(points.dtype, np.integer):
+        points = points.astype(np.float64)
+    points = points.reshape(-1, 2)
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    points = points[order]
+    if len(points) > 1:
+        fresh = np.ones(len(points), dtype=bool)
+        fresh[1:] = np.any(points[1:] != points[:-1], axis=1)
+        points = points[fresh]
+    return points
+
+
+def akl_toussaint(points, chunk=1 << 20):
+    """
+    Akl-Toussaint heuristic: drops the points strictly inside the polygon spanned by
+    the extremes in x, y, x + y and x - y. Every hull vertex survives.
+    """
+    points = np.asarray(points).reshape(-1, 2)
+    if len(points) < 9:
+        return points
+    x, y = points[:, 0], points[:, 1]
+    extremes = set()
+    for values in (x, y, x + y, x - y):
+        extremes.add(int(np.argmin(values)))
+        extremes.add(int(np.argmax(values)))
+    corners = sorted({tuple(points[i].tolist()) for i in extremes})
+    polygon = _graham_chain(corners)[:-1] + _graham_chain(corners[::-1])[:-1]
+    if len(polygon) < 3:
+        return points
+
+    keep = np.ones(len(points), dtype=bool)
+    edges = list(zip(polygon, polygon[1:] + polygon[:1]))
+    for start in range(0, len(points), chunk):
+        px = x[start:start + chunk]
+        py = y[start:start + chunk]
+        inside = np.ones(len(px), dtype=bool)
+        for (x1, y1), (x2, y2) in edges:
+            inside &= (x2 - x1) * (py - y1) - (y2 - y1) * (px - x1) > 0
+        keep[start:start + chunk] = ~inside
+    return points[keep]
+
+
+def _reduce(xs, ys):
+    """
+    Parallel part of the monotone chain: every pass drops, at once, all points that
+    do not turn left between their neighbours. Stops when a pass removes little and
+    leaves the rest to a sequential scan.
+    """
+    keep = np.arange(len(xs))
+    while len(keep) > 2:
+        o, a, b = keep[:-2], keep[1:-1], keep[2:]
+        cross = (xs[a] - xs[o]) * (ys[b] - ys[o]) - (ys[a] - ys[o]) * (xs[b] - xs[o])
+        concave = cross <= 0
+        removed = int(np.count_nonzero(concave))
+        if removed == 0:
+            break
+        mask = np.ones(len(keep), dtype=bool)
+        mask[1:-1] = ~concave
+        keep = keep[mask]
+        if removed * 16 < len(keep):
+            break
+    return keep
+
+
+def _prepare(points, prefilter):
+    points = np.asarray(points)
+    if prefilter:
+        points = akl_toussaint(points)
+    return _sorted_unique(points)
+
+
+def monotone_chain(points, prefilter=True):
+    """
+    Convex hull by Andrew's monotone chain with NumPy: points are sorted with lexsort,
+    concave points are removed in vectorized passes and a short sequential scan
+    finishes each chain. Returns the hull in the same order as Graham.
+    """
+    return _chain_hull(_prepare(points, prefilter))
+
+
+def _chain_hull(points):
+    """Monotone chain hull of points that are already sorted and unique."""
+    if len(points) < 3:
+        return [tuple(p) for p in points.tolist()]
+
+    reverse = points[::-1]
+    lower = _graham_chain(points[_reduce(points[:, 0], points[:, 1])].tolist())
+    upper = _graham_chain(reverse[_reduce(reverse[:, 0], reverse[:, 1])].tolist())
+    return [tuple(p) for p in lower[:-1] + upper[:-1]]
+
+
+def _negate(p):
+    return -p[0], -p[1]
+
+
+def _chain_insert(chain, p):
+    """
+    Adds p to a lower chain kept as a sorted list, popping the vertices it makes
+    concave. Returns the (old, new) vertex runs around p, or None if p is no vertex.
+    """
+    i = bisect_left(chain, p)
+    if i < len(chain) and chain[i] == p:
+        return None
+    if 0 < i < len(chain) and _cross(chain[i - 1], p, chain[i]) <= 0:
+        return None
+    lo = i
+    while lo >= 2 and _cross(chain[lo - 2], chain[lo - 1], p) <= 0:
+        lo -= 1
+    hi = i
+    while hi + 1 < len(chain) and _cross(p, chain[hi], chain[hi + 1]) <= 0:
+        hi += 1
+    old = chain[max(lo - 1, 0):hi + 1]
+    chain[lo:hi] = [p]
+    return old, chain[max(lo - 1, 0):lo + 2]
+
+
+class OnlineHull:
+    """
+    Convex hull maintained while points are added, in O(log n) amortized per point
+    plus the list shifts. The lower chain is a sorted list searched by bisection and
+    the upper chain is kept the same way as the lower chain of the negated points.
+    Edges are counted so a segment on both chains (collinear input) is one edge.
+    """
+
+    def __init__(self, points=()):
+        self._lower = []
+        self._upper = []
+        self._edges = Counter()
+        for point in points:
+            self.add(point)
+
+    def add(self, point):
+        """Adds a point and returns the (removed, added) hull edges as sorted point pairs."""
+        point = tuple(point)
+        changes = []
+        change = _chain_insert(self._lower, point)
+        if change is not None:
+            changes.append(change)
+        change = _chain_insert(self._upper, _negate(point))
+        if change is not None:
+            old, new = change
+            changes.append(([_negate(p) for p in old], [_negate(p) for p in new]))
+
+        touched = set()
+        before = {}
+        for old, new in changes:
+            for run, step in ((old, -1), (new, 1)):
+                for a, b in zip(run, run[1:]):
+                    edge = (a, b) if a <= b else (b, a)
+                    if edge not in before:
+                        before[edge] = self._edges[edge] > 0
+                    self._edges[edge] += step
+                    touched.add(edge)
+        removed, added = set(), set()
+        for edge in touched:
+            now = self._edges[edge] > 0
+            if now != before[edge]:
+                (added if now else removed).add(edge)
+            if not now:
+                del self._edges[edge]
+        return removed, added
+
+    def edges(self):
+        return set(self._edges)
+
+    def points(self):
+        """Hull vertices in the order Graham returns them."""
+        return self._lower[:-1] + [_negate(p) for p in self._upper][:-1]
@@ -0,0 +1,75 @@
+"""
+Times the convex hull algorithms on random square, disk or circle point sets
+and checks that they agree. On a circle nearly every point is a hull vertex.
+
+It imports the package as `scripts`, so run it from the repository root as a
+module:
+
+    python -m scripts.hull_benchmark --sizes 10000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from scripts.hull import akl_toussaint, monotone_chain
+from scripts.polygon_algorithms import Graham, Jarvis
+
+
+def make_points(count, shape, seed):
+    rng = np.random.default_rng(seed)
+    if shape in ("disk", "circle"):
+        radius = 10 ** 6 * (np.sqrt(rng.random(count)) if shape == "disk" else 1)
+        angle = 2 * np.pi * rng.random(count)
+        return np.column_stack((radius * np.cos(angle), radius * np.sin(angle))).astype(np.int64)
+    return rng.integers(0, 10 ** 6, size=(count, 2))
+
+
+def run(name, function):
+    start = time.perf_counter()
+    hull = function()
+    elapsed = time.perf_counter() - start
+    return name, elapsed, hull
+
+
+def benchmark(count, shape, python_limit, seed):
+    points = make_points(count, shape, seed)
+    candidates = [
+        ("monotone chain", lambda: monotone_chain(points)),
+        ("monotone chain (no filter)", lambda: monotone_chain(points, prefilter=False)),
+    ]
+    if count <= python_limit:
+        listed = [tuple(p) for p in points.tolist()]
+        candidates.append(("Graham", lambda: Graham(listed).get_points()))
+        # Jarvis is O(nh), quadratic when every point is on the hull.
+        if shape != "circle":
+            candidates.append(("Jarvis", lambda: Jarvis(listed).get_points()))
+
+    start = time.perf_counter()
+    kept = len(akl_toussaint(points))
+    print(f"{count} points ({shape}), Akl-Toussaint keeps {kept} in {time.perf_counter() - start:.3f} s")
+    reference = None
+    for name, function in candidates:
+        name, elapsed, hull = run(name, function)
+        if reference is None:
+            reference = hull
+        # Jarvis keeps collinear points and starts from the leftmost point, compare as sets.
+        same = hull == reference if name != "Jarvis" else set(reference) <= set(hull)
+        print(f"  {name:28} {elapsed:9.3f} s  {len(hull):6} vertices  {'ok' if same else 'MISMATCH'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares the convex hull algorithms. "
+                                                 "Run as python -m scripts.hull_benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--shape", choices=("square", "disk", "circle"), default="square")
+    parser.add_argument("--python-limit", type=int, default=1_000_000,
+                        help="largest size the pure Python Graham and Jarvis run on")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for count in args.sizes:
+        benchmark(count, args.shape, args.python_limit, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from fractions import Fraction
+from functools import cmp_to_key
+
+import numpy as np
+
+
+def segment_intersections(segments, polygon):
+    """
+    Intersects every segment (x1, y1, x2, y2) with every polygon edge in one call.
+    Returns one list of (x, y) points per segment, in polygon edge order, skipping
+    parallel edges and keeping touches (0 <= t, u <= 1) as the app always has.
+    """
+    segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    starts = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+    if len(starts) == 0:
+        return [[] for _ in range(len(segments))]
+    ends = np.roll(starts, -1, axis=0)
+
+    x1, y1, x2, y2 = (segments[:, k:k + 1] for k in range(4))
+    x3, y3 = starts[None, :, 0], starts[None, :, 1]
+    x4, y4 = ends[None, :, 0], ends[None, :, 1]
+
+    d = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
+    parallel = d == 0
+    d = np.where(parallel, 1.0, d)
+    t = ((x1 - x3) * (y3 - y4) - (y1 - y3) * (x3 - x4)) / d
+    u = ((x1 - x3) * (y1 - y2) - (y1 - y3) * (x1 - x2)) / d
+    hit = ~parallel & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+    x = x1 + t * (x2 - x1)
+    y = y1 + t * (y2 - y1)
+
+    result = [[] for _ in range(len(segments))]
+    for i, j in zip(*np.nonzero(hit)):
+        result[i].append((float(x[i, j]), float(y[i, j])))
+    return result
+
+
+def segment_intersection(p1, p2, polygon):
+    """Intersection points of the segment p1-p2 with the polygon edges."""
+    return segment_intersections([(*p1, *p2)], polygon)[0]
+
+
+class _Segment:
+    __slots__ = ("index", "left", "right", "dx", "dy")
+
+    def __init__(self, index, a, b):
+        self.index = index
+        self.left, self.right = (a, b) if a <= b else (b, a)
+        self.dx = self.right[0] - self.left[0]
+        self.dy = self.right[1] - self.left[1]
+
+    def side(self, p):
+        """-1 if p lies above the segment's line (towards greater y), 1 if below, 0 on it."""
+        cross = self.dx * (p[1] - self.left[1]) - self.dy * (p[0] - self.left[0])
+        return (cross < 0) - (cross > 0)
+
+
+def _by_direction(s, t):
+    cross = s.dx * t.dy - s.dy * t.dx
+    return (cross < 0) - (cross > 0)
+
+
+def _crossing(s, t):
+    d = s.dx * t.dy - s.dy * t.dx
+    if d == 0:
+        return None
+    ex = t.left[0] - s.left[0]
+    ey = t.left[1] - s.left[1]
+    a = Fraction(ex * t.dy - ey * t.dx) / Fraction(d)
+    b = Fraction(ex * s.dy - ey * s.dx) / Fraction(d)
+    if not (0 <= a <= 1 and 0 <= b <= 1):
+        return None
+    return s.left[0] + a * s.dx, s.left[1] + a * s.dy
+
+
+def self_intersections(points, first_only=False):
+    """
+    Reports where the edges of a closed polygon meet, other than adjacent edges at
+    their shared vertex, with a Bentley-Ottmann sweep over n + k events.
+    Edge i runs from points[i] to points[i + 1]; returns (i, j, x, y) with i < j,
+    one entry per pair and meeting point, ordered by x then y. Crossings are
+    computed with exact fractions. The status is a Python list kept in order by
+    bisection with orientation tests, so segments through the event point form one
+    run. Searching it is O(log n), but slice inserts and deletes shift the list, so
+    an event costs O(n) and the worst case is O((n + k) n), not O((n + k) log n).
+    With first_only=True the sweep stops at the first intersection found.
+    """
+    n = len(points)
+    segments = []
+    for i in range(n):
+        a, b = tuple(points[i]), tuple(points[(i + 1) % n])
+        if a != b:
+            segments.append(_Segment(i, a, b))
+    if len(segments) < 3:
+        return []
+
+    # Neighbouring edges, skipping repeated points, share a vertex and always meet there.
+    shared = {}
+    for k, s in enumerate(segments):
+        t = segments[(k + 1) % len(segments)]
+        vertex = tuple(points[(s.index + 1) % n])
+        shared[frozenset((s.index, t.index))] = vertex
+
+    events = {}
+    for s in segments:
+        events.setdefault(s.left, []).append(s)
+        events.setdefault(s.right, [])
+    queue = list(events)
+    heapq.heapify(queue)
+
+    def add_event(s, t, p):
+        point = _crossing(s, t)
+        if point is not None and point > p and point not in events:
+            events[point] = []
+            heapq.heappush(queue, point)
+
+    status = []
+    result = []
+    while queue:
+        p = heapq.heappop(queue)
+        upper = events.pop(p)
+
+        lo = bisect_left(status, 0, key=lambda s: s.side(p))
+        hi = bisect_right(status, 0, key=lambda s: s.side(p))
+        through = status[lo:hi]
+        del status[lo:hi]
+        passing = [s for s in through if s.right != p]
+
+        meeting = upper + through
+        if len(meeting) > 1:
+            for k, s in enumerate(meeting):
+                for t in meeting[k + 1:]:
+                    if shared.get(frozenset((s.index, t.index))) == p:
+                        continue
+                    i, j = sorted((s.index, t.index))
+                    result.append((i, j, float(p[0]), float(p[1])))
+                    if first_only:
+                        return result
+
+        inserted = sorted(upper + passing, key=cmp_to_key(_by_direction))
+        status[lo:lo] = inserted
+        if not inserted:
+            if 0 < lo < len(status):
+                add_event(status[lo - 1], status[lo], p)
+        else:
+            if lo > 0:
+                add_event(status[lo - 1], status[lo], p)
+            top = lo + len(inserted)
+            if top < len(status):
+                add_event(status[top - 1], status[top], p)
+
+    return result
@@ -1,5 +1,9 @@
 import math
 
+import numpy as np
+
+from scripts.pixel_buffer import PixelBuffer
+
 
 class LineAlgorithm:
     def __init__(self, x0, y0, x1, y1, color="black"):
@@ -12,17 +16,18 @@ class LineAlgorithm:
 
 class DDA(LineAlgorithm):
     def get_points(self):
-        points = []
+        points = PixelBuffer()
         dx = self.x1 - self.x0
         dy = self.y1 - self.y0
         steps = int(max(abs(dx), abs(dy)))
         if steps == 0:
-            return [(self.x0, self.y0)]
+            points.append(self.x0, self.y0, self.color)
+            return points
         x_inc = dx / steps
         y_inc = dy / steps
         x, y = self.x0, self.y0
         for i in range(steps + 1):
-            points.append((round(x), round(y), self.color))
+            points.append(round(x), round(y), self.color)
             x += x_inc
             y += y_inc
         return points
@@ -30,7 +35,7 @@ class DDA(LineAlgorithm):
 
 class Bresenham(LineAlgorithm):
     def get_points(self):
-        points = []
+        points = PixelBuffer()
         x0, y0, x1, y1 = self.x0, self.y0, self.x1, self.y1
         dx = abs(x1 - x0)
         dy = abs(y1 - y0)
@@ -39,7 +44,7 @@ class Bresenham(LineAlgorithm):
         err = dx - dy
 
         while True:
-            points.append((x0, y0, self.color))
+            points.append(x0, y0, self.color)
             if x0 == x1 and y0 == y1:
                 break
             e2 = 2 * err
@@ -54,12 +59,13 @@ class Bresenham(LineAlgorithm):
 
 class Wu(LineAlgorithm):
     def get_points(self):
-        points = []
+        points = PixelBuffer()
         x0, y0 = self.x0, self.y0
         x1, y1 = self.x1, self.y1
 
         if x0 == x1 and y0 == y1:
-            return [(x0, y0, self.color)]
+            points.append(x0, y0, self.color)
+            return points
 
         dx = x1 - x0
         dy = y1 - y0
@@ -82,9 +88,9 @@ class Wu(LineAlgorithm):
             gray = int(255 * (1 - intensity))
             color = f"#{gray:02x}{gray:02x}{gray:02x}"
             if steep:
-                points.append((y, x, color))
+                points.append(y, x, color)
             else:
-                points.append((x, y, color))
+                points.append(x, y, color)
 
         xend = round(x0)
         yend = y0 + gradient * (xend - x0)
@@ -118,3 +124,166 @@ class Wu(LineAlgorithm):
     @staticmethod
     def _rfpart(x):
         return 1 - Wu._fpart(x)
+
+
+class LineBatchAlgorithm:
+    """
+    Rasterizes many segments in one call.
+    `segments` is an (N, 4) array of x0, y0, x1, y1 rows. Subclasses define
+    `get_arrays`, which returns x, y, gray and offsets arrays, where pixels of
+    segment i are x[offsets[i]:offsets[i + 1]]; gray is None for solid lines.
+    """
+
+    def __init__(self, segments, color="black"):
+        self.segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+        self.color = color
+
+    def get_points(self):
+        x, y, gray, _ = self.get_arrays()
+        points = PixelBuffer()
+        if gray is None:
+            points.extend_arrays(x, y, self.color)
+        else:
+            shades, index = np.unique(gray, return_inverse=True)
+            colors = [self.color if g < 0 else f"#{g:02x}{g:02x}{g:02x}" for g in shades.tolist()]
+            points.extend_arrays(x, y, colors, index)
+        return points
+
+    @staticmethod
+    def _offsets(counts):
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return offsets
+
+    @staticmethod
+    def _accumulate(start, step, counts, offsets, out):
+        """
+        Writes start, start + step, start + step + step, ... (counts[i] values per row)
+        into out[offsets[i]:]. Sums are accumulated left to right exactly like the
+        scalar `x += x_inc` loops, rows are bucketed by length to bound padding.
+        """
+        order = np.argsort(counts, kind="stable")
+        order = order[counts[order] > 0]
+        lo = 0
+        while lo < len(order):
+            limit = 2 * counts[order[lo]]
+            hi = np.searchsorted(counts[order], limit, side="right")
+            rows = order[lo:hi]
+            width = counts[rows[-1]]
+            acc = np.empty((len(rows), width))
+            acc[:, 0] = start[rows]
+            acc[:, 1:] = step[rows, None]
+            np.cumsum(acc, axis=1, out=acc)
+            columns = np.arange(width)
+            mask = columns < counts[rows, None]
+            out[(offsets[rows, None] + columns)[mask]] = acc[mask]
+            lo = hi
+
+
+class BatchDDA(LineBatchAlgorithm):
+    def get_arrays(self):
+        x0, y0, x1, y1 = self.segments.T
+        dx = x1 - x0
+        dy = y1 - y0
+        steps = np.maximum(np.abs(dx), np.abs(dy)).astype(np.int64)
+        counts = steps + 1
+        offsets = self._offsets(counts)
+        safe = np.where(steps == 0, 1, steps)
+        xs = np.empty(offsets[-1])
+        ys = np.empty(offsets[-1])
+        self._accumulate(x0, dx / safe, counts, offsets, xs)
+        self._accumulate(y0, dy / safe, counts, offsets, ys)
+        return np.rint(xs).astype(np.int64), np.rint(ys).astype(np.int64), None, offsets
+
+
+class BatchBresenham(LineBatchAlgorithm):
+    def get_arrays(self):
+        x0, y0, x1, y1 = self.segments.astype(np.int64).T
+        dx = np.abs(x1 - x0)
+        dy = np.abs(y1 - y0)
+        sx = np.where(x0 < x1, 1, -1)
+        sy = np.where(y0 < y1, 1, -1)
+        major = np.maximum(dx, dy)
+        minor = np.minimum(dx, dy)
+        counts = major + 1
+        offsets = self._offsets(counts)
+
+        seg = np.repeat(np.arange(len(counts)), counts)
+        i = np.arange(offsets[-1]) - offsets[seg]
+        # Closed form of the error-term loop: the minor coordinate advances on
+        # floor((2 * i * minor + major - 1) / (2 * major)).
+        j = np.maximum(2 * i * minor[seg] + major[seg] - 1, 0) // np.maximum(2 * major[seg], 1)
+        x_major = dx[seg] >= dy[seg]
+        xs = x0[seg] + sx[seg] * np.where(x_major, i, j)
+        ys = y0[seg] + sy[seg] * np.where(x_major, j, i)
+        return xs, ys, None, offsets
+
+
+class BatchWu(LineBatchAlgorithm):
+    def get_arrays(self):
+        x0, y0, x1, y1 = self.segments.T.copy()
+        single = (x0 == x1) & (y0 == y1)
+        steep = np.abs(y1 - y0) > np.abs(x1 - x0)
+        x0, y0 = np.where(steep, y0, x0), np.where(steep, x0, y0)
+        x1, y1 = np.where(steep, y1, x1), np.where(steep, x1, y1)
+        swap = x0 > x1
+        x0, x1 = np.where(swap, x1, x0), np.where(swap, x0, x1)
+        y0, y1 = np.where(swap, y1, y0), np.where(swap, y0, y1)
+        dx = x1 - x0
+        dy = y1 - y0
+        gradient = np.divide(dy, dx, out=np.ones_like(dx), where=dx != 0)
+
+        xpxl1 = np.rint(x0)
+        yend1 = y0 + gradient * (xpxl1 - x0)
+        xgap1 = 1 - self._fpart(x0 + 0.5)
+        xpxl2 = np.rint(x1)
+        yend2 = y1 + gradient * (xpxl2 - x1)
+        xgap2 = self._fpart(x1 + 0.5)
+
+        inner = np.where(single, 0, np.maximum(xpxl2 - xpxl1 - 1, 0)).astype(np.int64)
+        counts = np.where(single, 1, 4 + 2 * inner)
+        offsets = self._offsets(counts)
+        total = offsets[-1]
+        major = np.empty(total)
+        minor = np.empty(total)
+        intensity = np.zeros(total)
+
+        ends = offsets[:-1][~single]
+        for k, (px, py, weight, upper) in enumerate((
+                (xpxl1, yend1, xgap1, False), (xpxl1, yend1, xgap1, True),
+                (xpxl2, yend2, xgap2, False), (xpxl2, yend2, xgap2, True))):
+            px, py, weight = px[~single], py[~single], weight[~single]
+            major[ends + k] = px
+            minor[ends + k] = np.floor(py) + upper
+            intensity[ends + k] = (self._fpart(py) if upper else 1 - self._fpart(py)) * weight
+
+        intery = np.empty(inner.sum())
+        inner_offsets = self._offsets(inner)
+        self._accumulate(yend1 + gradient, gradient, inner, inner_offsets, intery)
+        seg = np.repeat(np.arange(len(inner)), inner)
+        step = np.arange(len(intery)) - inner_offsets[seg]
+        base = offsets[seg] + 4 + 2 * step
+        floor = np.floor(intery)
+        major[base] = major[base + 1] = xpxl1[seg] + 1 + step
+        minor[base] = floor
+        minor[base + 1] = floor + 1
+        intensity[base] = 1 - self._fpart(intery)
+        intensity[base + 1] = self._fpart(intery)
+
+        gray = (255 * (1 - np.clip(intensity, 0.0, 1.0))).astype(np.int16)
+        starts = offsets[:-1][single]
+        major[starts] = self.segments[single, 0]
+        minor[starts] = self.segments[single, 1]
+        gray[starts] = -1
+
+        steep = np.repeat(steep & ~single, counts)
+        xs = np.where(steep, minor, major).astype(np.int64)
+        ys = np.where(steep, major, minor).astype(np.int64)
+        return xs, ys, gray, offsets
+
+    @staticmethod
+    def _fpart(x):
+        return x - np.floor(x)
+
+
+BATCH_ALGORITHMS = {DDA: BatchDDA, Bresenham: BatchBresenham, Wu: BatchWu}
@@ -1,31 +1,125 @@
 import math
 
+import numpy as np
 
-def create_matrix(rows, cols, data):
-    return [data[i * cols:(i + 1) * cols] for i in range(rows)]
+from scripts.line_algorithms import BatchBresenham
+from scripts.pixel_buffer import PixelBuffer
 
 
-def matrix_mult(a, b):
-    rows_a, cols_a = len(a), len(a[0])
-    rows_b, cols_b = len(b), len(b[0])
-    if cols_a != rows_b:
-        raise ValueError("Matrices cannot be multiplied")
-    result = create_matrix(rows_a, cols_b, [0] * (rows_a * cols_b))
-    for i in range(rows_a):
-        for j in range(cols_b):
-            for k in range(cols_a):
-                result[i][j] += a[i][k] * b[k][j]
-    return result
+HERMITE = np.array([
+    [2, -2, 1, 1],
+    [-3, 3, -2, -1],
+    [0, 0, 1, 0],
+    [1, 0, 0, 0]
+], dtype=np.float64)
 
+BEZIER = np.array([
+    [-1, 3, -3, 1],
+    [3, -6, 3, 0],
+    [-3, 3, 0, 0],
+    [1, 0, 0, 0]
+], dtype=np.float64)
 
-def my_linspace(start, stop, num):
-    if num == 1:
-        return [start]
-    step = (stop - start) / (num - 1)
-    return [start + i * step for i in range(num)]
+BSPLINE = np.array([
+    [-1 / 6, 3 / 6, -3 / 6, 1 / 6],
+    [3 / 6, -6 / 6, 3 / 6, 0],
+    [-3 / 6, 0, 3 / 6, 0],
+    [1 / 6, 4 / 6, 1 / 6, 0]
+], dtype=np.float64)
+
+
+def bezier_control_points(basis, geometry):
+    """Control points of the Bezier curves equal to the given (4, 2) or (curves, 4, 2) ones."""
+    return np.linalg.solve(BEZIER, basis) @ np.asarray(geometry, dtype=np.float64)
+
+
+def _split(bezier):
+    """de Casteljau at t = 1/2 for a stack of (k, 4, 2) Bezier control points."""
+    p0, p1, p2, p3 = bezier[:, 0], bezier[:, 1], bezier[:, 2], bezier[:, 3]
+    p01 = (p0 + p1) / 2
+    p12 = (p1 + p2) / 2
+    p23 = (p2 + p3) / 2
+    p012 = (p01 + p12) / 2
+    p123 = (p12 + p23) / 2
+    mid = (p012 + p123) / 2
+    return np.stack((p0, p01, p012, mid), axis=1), np.stack((mid, p123, p23, p3), axis=1)
+
+
+def _subdivide(bezier, tolerance, max_depth):
+    """
+    Splits a stack of (k, 4, 2) Bezier pieces until all are flat, in order.
+    Returns the pieces and the index of the input piece each one came from.
+    """
+    curve = np.arange(len(bezier))
+    for _ in range(max_depth):
+        second = np.maximum(np.abs(bezier[:, 0] - 2 * bezier[:, 1] + bezier[:, 2]).max(axis=1),
+                            np.abs(bezier[:, 1] - 2 * bezier[:, 2] + bezier[:, 3]).max(axis=1))
+        split = 0.75 * second > tolerance
+        if not split.any():
+            break
+        # Each piece that splits is replaced in place by its two halves, keeping curve order.
+        at = np.arange(len(bezier)) + np.concatenate(([0], np.cumsum(split)[:-1]))
+        pieces = np.empty((len(bezier) + int(split.sum()), 4, 2))
+        left, right = _split(bezier[split])
+        pieces[at[~split]] = bezier[~split]
+        pieces[at[split]] = left
+        pieces[at[split] + 1] = right
+        curve = np.repeat(curve, 1 + split)
+        bezier = pieces
+    return bezier, curve
+
+
+def flatten(bezier, tolerance=0.5, max_depth=24):
+    """
+    Adaptive flattening by recursive de Casteljau subdivision, run on all pending
+    pieces at once: a piece is flat once 3/4 of its largest second difference, which
+    bounds the distance between the curve and its chord, is within `tolerance`.
+    Takes (4, 2) or (curves, 4, 2) Bezier control points and returns the polyline of
+    every curve as a list of (k, 2) arrays.
+    """
+    bezier = np.asarray(bezier, dtype=np.float64)
+    single = bezier.ndim == 2
+    bezier, curve = _subdivide(bezier.reshape(-1, 4, 2), tolerance, max_depth)
+    starts = np.searchsorted(curve, np.arange(curve[-1] + 1 if len(curve) else 0))
+    polylines = [np.concatenate((piece[:, 0], piece[-1:, 3])) for piece in np.split(bezier, starts[1:])]
+    return polylines[0] if single else polylines
+
+
+def flatten_path(bezier, tolerance=0.5, max_depth=24):
+    """
+    Polyline of a path of (segments, 4, 2) Bezier pieces where every segment starts
+    where the previous one ends, flattened like `flatten` in one pass.
+    """
+    bezier, _ = _subdivide(np.asarray(bezier, dtype=np.float64).reshape(-1, 4, 2), tolerance, max_depth)
+    return np.concatenate((bezier[:, 0], bezier[-1:, 3]))
+
+
+def rasterize_polyline(points, color):
+    """
+    Joins consecutive polyline points, rounded to pixels, with Bresenham lines and
+    keeps every pixel once, in drawing order.
+    """
+    points = np.rint(np.asarray(points, dtype=np.float64)).astype(np.int64).reshape(-1, 2)
+    moved = np.ones(len(points), dtype=bool)
+    moved[1:] = np.any(points[1:] != points[:-1], axis=1)
+    points = points[moved]
+    if len(points) == 1:
+        xs, ys = points[:, 0], points[:, 1]
+    else:
+        xs, ys, _, _ = BatchBresenham(np.hstack((points[:-1], points[1:]))).get_arrays()
+    # Pixels packed into one integer key: a 1-D unique is far faster than axis=0.
+    x0, y0 = xs.min(), ys.min()
+    _, first = np.unique((xs - x0) * (ys.max() - y0 + 1) + (ys - y0), return_index=True)
+    first.sort()
+    buffer = PixelBuffer()
+    buffer.extend_arrays(xs[first], ys[first], color)
+    return buffer
 
 
 class ParametricAlgorithm:
+    basis = None
+    tolerance = 0.5
+
     def __init__(self, x0, y0, x1, y1, color="red"):
         self.x0 = x0
         self.y0 = y0
@@ -33,86 +127,53 @@ class ParametricAlgorithm:
         self.y1 = y1
         self.color = color
 
-
-class HermiteAlgorithm(ParametricAlgorithm):
     def get_points(self):
+        points = PixelBuffer()
+        if self.x0 == self.x1 and self.y0 == self.y1:
+            points.append(self.x0, self.y0, self.color)
+            return points
+        polyline = flatten(bezier_control_points(self.basis, self.geometry()), self.tolerance)
+        return rasterize_polyline(polyline, self.color)
+
+    def _control_points(self):
+        """The 4 control points both Bezier and B-spline build from the two clicks."""
         dx = self.x1 - self.x0
         dy = self.y1 - self.y0
         distance = math.sqrt(dx * dx + dy * dy)
-        if distance == 0:
-            return [(self.x0, self.y0, self.color)]
         k = distance / 3.0
-        tx = -dy / distance * k
-        ty = dx / distance * k
-
-        m_hermite = [
-            [2, -2, 1, 1],
-            [-3, 3, -2, -1],
-            [0, 0, 1, 0],
-            [1, 0, 0, 0]
+        offset_x = -dy / distance * k
+        offset_y = dx / distance * k
+        return [
+            [self.x0, self.y0],
+            [self.x0 + dx / 3.0 + offset_x, self.y0 + dy / 3.0 + offset_y],
+            [self.x0 + 2 * dx / 3.0 + offset_x, self.y0 + 2 * dy / 3.0 + offset_y],
+            [self.x1, self.y1]
         ]
-        vec_x = [self.x0, self.x1, tx, ty]
-        vec_y = [self.y0, self.y1, tx, ty]
 
-        mat_px = create_matrix(4, 1, vec_x)
-        mat_py = create_matrix(4, 1, vec_y)
-
-        coeffs_x = matrix_mult(m_hermite, mat_px)
-        coeffs_y = matrix_mult(m_hermite, mat_py)
-
-        t_values = my_linspace(0, 1, 100)
-        points = []
-        for t in t_values:
-            t_vector = [t ** 3, t ** 2, t, 1]
-            x = sum(t_vector[i] * coeffs_x[i][0] for i in range(4))
-            y = sum(t_vector[i] * coeffs_y[i][0] for i in range(4))
-            points.append((int(round(x)), int(round(y)), self.color))
-        return points
 
+class HermiteAlgorithm(ParametricAlgorithm):
+    basis = HERMITE
 
-class BezierAlgorithm(ParametricAlgorithm):
-    def get_points(self):
+    def geometry(self):
         dx = self.x1 - self.x0
         dy = self.y1 - self.y0
         distance = math.sqrt(dx * dx + dy * dy)
-        if distance == 0:
-            return [(self.x0, self.y0, self.color)]
         k = distance / 3.0
-
-        offset_x = -dy / distance * k
-        offset_y = dx / distance * k
-
-        p0x, p0y = self.x0, self.y0
-        p3x, p3y = self.x1, self.y1
-        p1x = self.x0 + dx / 3.0 + offset_x
-        p1y = self.y0 + dy / 3.0 + offset_y
-        p2x = self.x0 + 2 * dx / 3.0 + offset_x
-        p2y = self.y0 + 2 * dy / 3.0 + offset_y
-
-        m_bezier = [
-            [-1, 3, -3, 1],
-            [3, -6, 3, 0],
-            [-3, 3, 0, 0],
-            [1, 0, 0, 0]
+        tx = -dy / distance * k
+        ty = dx / distance * k
+        return [
+            [self.x0, self.y0],
+            [self.x1, self.y1],
+            [tx, tx],
+            [ty, ty]
         ]
 
-        vec_x = [p0x, p1x, p2x, p3x]
-        vec_y = [p0y, p1y, p2y, p3y]
-
-        mat_px = create_matrix(4, 1, vec_x)
-        mat_py = create_matrix(4, 1, vec_y)
 
-        coeffs_x = matrix_mult(m_bezier, mat_px)
-        coeffs_y = matrix_mult(m_bezier, mat_py)
+class BezierAlgorithm(ParametricAlgorithm):
+    basis = BEZIER
 
-        t_values = my_linspace(0, 1, 100)
-        points = []
-        for t in t_values:
-            t_vector = [t ** 3, t ** 2, t, 1]
-            x = sum(t_vector[i] * coeffs_x[i][0] for i in range(4))
-            y = sum(t_vector[i] * coeffs_y[i][0] for i in range(4))
-            points.append((int(round(x)), int(round(y)), self.color))
-        return points
+    def geometry(self):
+        return self._control_points()
 
 
 class BSplineAlgorithm(ParametricAlgorithm):
@@ -121,45 +182,69 @@ class BSplineAlgorithm(ParametricAlgorithm):
     For a B-spline, 4 control points are created in the same way as for Bézier.
     Single segment B-spline
     """
+    basis = BSPLINE
 
-    def get_points(self):
-        dx = self.x1 - self.x0
-        dy = self.y1 - self.y0
-        distance = math.sqrt(dx * dx + dy * dy)
-        if distance == 0:
-            return [(self.x0, self.y0, self.color)]
-        k = distance / 3.0
-        offset_x = -dy / distance * k
-        offset_y = dx / distance * k
+    def geometry(self):
+        return self._control_points()
 
-        p0x, p0y = self.x0, self.y0
-        p3x, p3y = self.x1, self.y1
-        p1x = self.x0 + dx / 3.0 + offset_x
-        p1y = self.y0 + dy / 3.0 + offset_y
-        p2x = self.x0 + 2 * dx / 3.0 + offset_x
-        p2y = self.y0 + 2 * dy / 3.0 + offset_y
-
-        m_bspline = [
-            [-1 / 6, 3 / 6, -3 / 6, 1 / 6],
-            [3 / 6, -6 / 6, 3 / 6, 0],
-            [-3 / 6, 0, 3 / 6, 0],
-            [1 / 6, 4 / 6, 1 / 6, 0]
-        ]
 
-        vec_x = [p0x, p1x, p2x, p3x]
-        vec_y = [p0y, p1y, p2y, p3y]
+class SplineAlgorithm:
+    """
+    Piecewise cubic curve over a control polygon of any length. Subclasses define
+    `segments`, which returns the (segments, 4, 2) geometry of all pieces; they are
+    converted to Bezier form with one matrix product and flattened together, without
+    a loop over the segments.
+    """
+    basis = None
+    tolerance = 0.5
+
+    def __init__(self, points, closed=False, color="red"):
+        self.points = points
+        self.closed = closed
+        self.color = color
 
-        mat_px = create_matrix(4, 1, vec_x)
-        mat_py = create_matrix(4, 1, vec_y)
+    def get_points(self):
+        points = PixelBuffer()
+        if not self.points:
+            return points
+        if len(self.points) == 1:
+            x, y = self.points[0]
+            points.append(x, y, self.color)
+            return points
+        polyline = flatten_path(bezier_control_points(self.basis, self.segments()), self.tolerance)
+        return rasterize_polyline(polyline, self.color)
+
+
+class BSplineCurve(SplineAlgorithm):
+    """
+    Uniform cubic B-spline. Segment i blends control points i .. i + 3; an open curve
+    repeats its end points so that it starts and ends on them, a closed one wraps around.
+    """
+    basis = BSPLINE
 
-        coeffs_x = matrix_mult(m_bspline, mat_px)
-        coeffs_y = matrix_mult(m_bspline, mat_py)
+    def segments(self):
+        control = np.asarray(self.points, dtype=np.float64).reshape(-1, 2)
+        if self.closed:
+            index = (np.arange(len(control))[:, None] + np.arange(4)) % len(control)
+        else:
+            control = np.concatenate((control[:1], control[:1], control, control[-1:], control[-1:]))
+            index = np.arange(len(control) - 3)[:, None] + np.arange(4)
+        return control[index]
 
-        t_values = my_linspace(0, 1, 100)
-        points = []
-        for t in t_values:
-            t_vector = [t ** 3, t ** 2, t, 1]
-            x = sum(t_vector[i] * coeffs_x[i][0] for i in range(4))
-            y = sum(t_vector[i] * coeffs_y[i][0] for i in range(4))
-            points.append((int(round(x)), int(round(y)), self.color))
-        return points
+
+class BezierPath(SplineAlgorithm):
+    """
+    Composite cubic Bezier path: points 3i .. 3i + 3 form segment i, so neighbouring
+    segments share an end point. A closed path returns to the first point, and a
+    short last segment is padded by repeating its final point.
+    """
+    basis = BEZIER
+
+    def segments(self):
+        control = np.asarray(self.points, dtype=np.float64).reshape(-1, 2)
+        if self.closed:
+            control = np.concatenate((control, control[:1]))
+        padding = -(len(control) - 1) % 3
+        control = np.concatenate((control, np.repeat(control[-1:], padding, axis=0)))
+        index = 3 * np.arange((len(control) - 1) // 3)[:, None] + np.arange(4)
+        return control[index]
@@ -0,0 +1,100 @@
+from array import array
+
+import numpy as np
+
+
+class PixelBuffer:
+    """
+    Compact storage for rasterized pixels.
+    Coordinates live in int32 arrays and every pixel keeps a 16-bit index into a
+    shared palette, so a color string is stored once per buffer instead of once per
+    pixel. Iterating yields (x, y, color) like the lists the algorithms used to return.
+    Float coordinates, which the scalar algorithms produce from float endpoints, are
+    rounded to the nearest integer.
+    """
+
+    def __init__(self):
+        self._x = array('i')
+        self._y = array('i')
+        self._color = array('H')
+        self.palette = []
+        self._palette_index = {}
+
+    def _color_index(self, color):
+        index = self._palette_index.get(color)
+        if index is None:
+            index = len(self.palette)
+            if index > 0xFFFF:
+                raise ValueError("Palette overflow: too many distinct colors")
+            self.palette.append(color)
+            self._palette_index[color] = index
+        return index
+
+    def append(self, x, y, color):
+        if type(x) is not int or type(y) is not int:
+            x, y = int(round(x)), int(round(y))
+        self._x.append(x)
+        self._y.append(y)
+        self._color.append(self._color_index(color))
+
+    def extend(self, points):
+        if isinstance(points, PixelBuffer):
+            xs, ys, index = points.as_arrays()
+            self.extend_arrays(xs, ys, points.palette, index)
+            return
+        for x, y, color in points:
+            self.append(x, y, color)
+
+    def extend_arrays(self, xs, ys, colors, index=None):
+        """
+        Appends pixels given as arrays. `colors` is a single color, or a list of
+        colors addressed by the per-pixel `index` array.
+        """
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        if not np.issubdtype(xs.dtype, np.integer):
+            xs = np.rint(xs)
+        if not np.issubdtype(ys.dtype, np.integer):
+            ys = np.rint(ys)
+        xs = xs.astype(np.int32)
+        ys = ys.astype(np.int32)
+        if len(xs) != len(ys):
+            raise ValueError("Coordinate arrays must have the same length")
+        if index is None:
+            local = np.full(len(xs), self._color_index(colors), dtype=np.uint16)
+        else:
+            remap = np.array([self._color_index(color) for color in colors], dtype=np.uint16)
+            local = remap[np.asarray(index, dtype=np.intp)] if len(remap) else np.zeros(0, np.uint16)
+        self._x.frombytes(xs.tobytes())
+        self._y.frombytes(ys.tobytes())
+        self._color.frombytes(local.tobytes())
+
+    def as_arrays(self):
+        """Returns copies of the x, y and palette index arrays."""
+        return (np.frombuffer(self._x, dtype=np.int32).copy(),
+                np.frombuffer(self._y, dtype=np.int32).copy(),
+                np.frombuffer(self._color, dtype=np.uint16).copy())
+
+    def translated(self, dx, dy):
+        """Returns a copy with every pixel moved by (dx, dy)."""
+        buffer = PixelBuffer()
+        buffer.palette = list(self.palette)
+        buffer._palette_index = dict(self._palette_index)
+        buffer._x.frombytes((np.frombuffer(self._x, dtype=np.int32) + np.int32(dx)).tobytes())
+        buffer._y.frombytes((np.frombuffer(self._y, dtype=np.int32) + np.int32(dy)).tobytes())
+        buffer._color = array('H', self._color)
+        return buffer
+
+    def __len__(self):
+        return len(self._x)
+
+    def __getitem__(self, index):
+        return self._x[index], self._y[index], self.palette[self._color[index]]
+
+    def __iter__(self):
+        palette = self.palette
+        for x, y, color in zip(self._x, self._y, self._color):
+            yield x, y, palette[color]
+
+    def __repr__(self):
+        return f"PixelBuffer({len(self)} pixels, {len(self.palette)} colors)"
@@ -1,3 +1,9 @@
+import math
+from itertools import chain
+
+import numpy as np
+
+
 def is_point_inside(points, x, y):
     if len(points) < 3:
         return False
@@ -64,3 +70,150 @@ def point_on_segment(pt, p1, p2):
         return False
 
     return True
+
+
+def points_inside(points, queries, boundary=True, block=1 << 22):
+    """
+    Batch version of is_point_inside for an (M, 2) array of query points.
+    Returns a boolean mask from the crossing number over all edges at once, with the
+    same arithmetic as the scalar test. With boundary=True points on an edge count as
+    inside (as in is_point_inside), with boundary=False they count as outside.
+    Edges are processed in chunks of at most `block` query-edge pairs.
+    """
+    queries = np.asarray(queries, dtype=np.float64).reshape(-1, 2)
+    if len(points) < 3:
+        return np.zeros(len(queries), dtype=bool)
+
+    x = queries[:, 0:1]
+    y = queries[:, 1:2]
+    odd = np.zeros(len(queries), dtype=bool)
+    on_edge = np.zeros(len(queries), dtype=bool)
+    for x1, y1, x2, y2 in _edge_chunks(points, len(queries), block):
+        straddle = (y1 > y) != (y2 > y)
+        dy = np.where(y2 == y1, 1.0, y2 - y1)
+        x_inters = ((y - y1) * (x2 - x1)) / dy + x1
+        odd ^= np.logical_and(straddle, x <= x_inters).sum(axis=1) % 2 == 1
+        on_edge |= _on_segments(x, y, x1, y1, x2, y2).any(axis=1)
+
+    if boundary:
+        return odd | on_edge
+    return odd & ~on_edge
+
+
+def points_on_boundary(points, queries, block=1 << 22):
+    """Batch version of is_on_boundary for an (M, 2) array of query points."""
+    queries = np.asarray(queries, dtype=np.float64).reshape(-1, 2)
+    x = queries[:, 0:1]
+    y = queries[:, 1:2]
+    on_edge = np.zeros(len(queries), dtype=bool)
+    for x1, y1, x2, y2 in _edge_chunks(points, len(queries), block):
+        on_edge |= _on_segments(x, y, x1, y1, x2, y2).any(axis=1)
+    return on_edge
+
+
+def _edge_chunks(points, count, block):
+    starts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    ends = np.roll(starts, -1, axis=0)
+    step = max(1, block // max(count, 1))
+    for i in range(0, len(starts), step):
+        yield (starts[None, i:i + step, 0], starts[None, i:i + step, 1],
+               ends[None, i:i + step, 0], ends[None, i:i + step, 1])
+
+
+def _on_segments(x, y, x1, y1, x2, y2):
+    in_box = ((x >= np.minimum(x1, x2) - 1e-8) & (x <= np.maximum(x1, x2) + 1e-8) &
+              (y >= np.minimum(y1, y2) - 1e-8) & (y <= np.maximum(y1, y2) + 1e-8))
+    cross_product = (x - x1) * (y2 - y1) - (y - y1) * (x2 - x1)
+    return in_box & (np.abs(cross_product) <= 1e-8)
+
+
+class PreparedPolygon:
+    """
+    Polygon with a uniform y-band edge index for repeated is_point_inside /
+    is_on_boundary queries. Every band lists the edges whose y range (padded by the
+    boundary tolerance) overlaps it, so a query only looks at the edges of its band,
+    O(1) on average. Edges spanning more than LONG_EDGE_BANDS bands go to one shared
+    list checked by every query instead, so building stays O(n) for tall edges. The
+    index is rebuilt lazily when `points` is reassigned or its length changes; call
+    `invalidate` after other in-place edits, such as moving a vertex.
+    """
+
+    LONG_EDGE_BANDS = 8
+
+    def __init__(self, points):
+        self._version = 0
+        self.points = points
+        self._bands = []
+        self._long_edges = []
+        self._y0 = 0.0
+        self._band_height = 1.0
+
+    @property
+    def points(self):
+        return self._points
+
+    @points.setter
+    def points(self, points):
+        self._points = points
+        self.invalidate()
+
+    def invalidate(self):
+        self._version += 1
+        self._key = None
+
+    def is_point_inside(self, x, y):
+        edges = self._edges_at(y)
+        if len(self.points) < 3:
+            return False
+
+        inside = False
+        for p1, p2 in edges:
+            if point_on_segment((x, y), p1, p2):
+                return True
+
+            if (p1[1] > y) != (p2[1] > y):
+                x_inters = ((y - p1[1]) * (p2[0] - p1[0])) / (p2[1] - p1[1]) + p1[0]
+                if x <= x_inters:
+                    inside = not inside
+
+        return inside
+
+    def is_on_boundary(self, x, y):
+        return any(point_on_segment((x, y), p1, p2) for p1, p2 in self._edges_at(y))
+
+    def _edges_at(self, y):
+        self._prepare()
+        if not self._bands:
+            return ()
+        band = math.floor((y - self._y0) / self._band_height)
+        if band < 0 or band > len(self._bands):
+            return ()
+        return chain(self._bands[min(band, len(self._bands) - 1)], self._long_edges)
+
+    def _prepare(self):
+        points = self.points
+        key = (id(points), len(points), self._version)
+        if key == self._key:
+            return
+        self._key = key
+        self._bands = []
+        self._long_edges = []
+        if not points:
+            return
+
+        n = len(points)
+        min_y = min(p[1] for p in points) - 1e-8
+        max_y = max(p[1] for p in points) + 1e-8
+        self._y0 = min_y
+        self._band_height = (max_y - min_y) / n
+        self._bands = [[] for _ in range(n)]
+        for i in range(n):
+            p1 = points[i]
+            p2 = points[(i + 1) % n]
+            first = max(math.floor((min(p1[1], p2[1]) - 1e-8 - min_y) / self._band_height), 0)
+            last = min(math.floor((max(p1[1], p2[1]) + 1e-8 - min_y) / self._band_height), n - 1)
+            if last - first >= self.LONG_EDGE_BANDS:
+                self._long_edges.append((p1, p2))
+                continue
+            for band in range(first, last + 1):
+                self._bands[band].append((p1, p2))
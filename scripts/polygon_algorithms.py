@@ -1,20 +1,49 @@
+from collections import namedtuple
+
 import numpy as np
 
+from scripts.hull import monotone_chain
+from scripts.intersections import self_intersections
+
+PolygonAnalysis = namedtuple("PolygonAnalysis", ["convex", "orientation", "simple", "normals"])
+
+
+def analyze_polygon(points):
+    """
+    Convexity, orientation, simplicity and internal normals of a closed polygon from
+    one array pass over its vertices. Orientation is the sign of the shoelace area
+    (1, -1 or 0). A polygon is convex when its turns never change sign or reverse and
+    add up to one full turn, which rules out star polygons; convex polygons are simple
+    without further work, others go through a sweep that stops at the first crossing.
+    """
+    n = len(points)
+    if n < 3:
+        return PolygonAnalysis(False, 0, False, [])
+
+    o = np.asarray(points)
+    a = np.roll(o, -1, axis=0)
+    b = np.roll(o, -2, axis=0)
+    edge = a - o
+    following = b - a
+    cross = edge[:, 0] * following[:, 1] - edge[:, 1] * following[:, 0]
+    normals = [tuple(normal) for normal in np.column_stack((-edge[:, 1], edge[:, 0])).tolist()]
+    area = np.sum(o[:, 0] * a[:, 1] - a[:, 0] * o[:, 1])
+    orientation = int(np.sign(area))
+
+    convex = not (bool(np.any(cross > 0)) and bool(np.any(cross < 0)))
+    if convex:
+        dot = edge[:, 0] * following[:, 0] + edge[:, 1] * following[:, 1]
+        reversed_turn = bool(np.any((cross == 0) & (dot < 0)))
+        turning = np.sum(np.arctan2(cross, dot))
+        convex = not reversed_turn and bool(abs(abs(turning) - 2 * np.pi) < 1e-6)
+    simple = convex or not self_intersections(points, first_only=True)
+    return PolygonAnalysis(convex, orientation, simple, normals)
+
 
 class PolygonAlgorithm:
     def __init__(self, points):
         self.points = points
 
-    def _get_internal_normals(self):
-        normals = []
-        n = len(self.points)
-        for i in range(n):
-            p1, p2 = self.points[i], self.points[(i + 1) % n]
-            dx = p2[0] - p1[0]
-            dy = p2[1] - p1[1]
-            normals.append((-dy, dx))
-        return normals
-
     def _draw_normals(self, normals):
         if not normals:
             return
@@ -29,21 +58,15 @@ class PolygonAlgorithm:
 
         return tuple(result)
 
-    def check_convexity(self):
-        def cross_product(o, a, b):
-            return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
-
-        signs = []
-        n = len(self.points)
-        for i in range(n):
-            o, a, b = self.points[i], self.points[(i + 1) % n], self.points[(i + 2) % n]
-            signs.append(np.sign(cross_product(o, a, b)))
+    def analyze(self):
+        return analyze_polygon(self.points)
 
-        if all(s >= 0 for s in signs) or all(s <= 0 for s in signs):
-            normals = self._get_internal_normals()
-            return self._draw_normals(normals)
-        else:
-            return None
+    def check_convexity(self, analysis=None):
+        if analysis is None:
+            analysis = self.analyze()
+        if analysis.convex:
+            return self._draw_normals(analysis.normals)
+        return None
 
 
 class Graham(PolygonAlgorithm):
@@ -85,3 +108,8 @@ class Jarvis(PolygonAlgorithm):
             if p == leftmost:
                 break
         return hull
+
+
+class MonotoneChain(PolygonAlgorithm):
+    def get_points(self):
+        return monotone_chain(self.points)
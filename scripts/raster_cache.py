@@ -0,0 +1,64 @@
+from collections import OrderedDict
+
+from scripts.curve_algorithms import (Circle, Ellipse, Hyperbola, Parabola, MidpointHyperbola, MidpointParabola,
+                                      FilledCircle, FilledEllipse)
+from scripts.line_algorithms import Bresenham
+
+# Rasterizers that work in coordinates relative to (x0, y0) with integer or
+# position-independent arithmetic, so a moved pattern equals a fresh call exactly.
+TRANSLATION_EXACT = (Bresenham, Circle, Ellipse, Hyperbola, Parabola, MidpointHyperbola, MidpointParabola,
+                     FilledCircle, FilledEllipse)
+
+
+class RasterCache:
+    """
+    Memoizes two-point rasterizers by their relative geometry: the pixels of
+    algorithm(x0, y0, x1, y1) are the pixels of algorithm(0, 0, x1 - x0, y1 - y0)
+    moved by (x0, y0), so a pattern is computed once and translated on every hit.
+    Only the `exact` classes are cached; others (DDA, Wu and the parametric curves
+    round floats that depend on the position) are called directly. Least recently
+    used patterns are evicted once the cached pixels exceed `max_pixels`.
+    """
+
+    def __init__(self, max_pixels=1_000_000, exact=TRANSLATION_EXACT):
+        self.max_pixels = max_pixels
+        self.exact = exact
+        self.hits = 0
+        self.misses = 0
+        self.pixels = 0
+        self._patterns = OrderedDict()
+
+    def get_points(self, algorithm, x0, y0, x1, y1, color=None):
+        """Pixels of algorithm(x0, y0, x1, y1, color); color=None keeps the class default."""
+        if algorithm not in self.exact:
+            args = (x0, y0, x1, y1)
+            return algorithm(*args).get_points() if color is None else algorithm(*args, color).get_points()
+
+        key = (algorithm, x1 - x0, y1 - y0, color)
+        pattern = self._patterns.get(key)
+        if pattern is not None:
+            self.hits += 1
+            self._patterns.move_to_end(key)
+            return pattern.translated(x0, y0)
+
+        self.misses += 1
+        args = (0, 0, x1 - x0, y1 - y0)
+        pattern = algorithm(*args).get_points() if color is None else algorithm(*args, color).get_points()
+        if len(pattern) <= self.max_pixels:
+            self._patterns[key] = pattern
+            self.pixels += len(pattern)
+            while self.pixels > self.max_pixels:
+                _, evicted = self._patterns.popitem(last=False)
+                self.pixels -= len(evicted)
+        return pattern.translated(x0, y0)
+
+    def clear(self):
+        self._patterns.clear()
+        self.pixels = 0
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def __repr__(self):
+        return (f"RasterCache({len(self)} patterns, {self.pixels}/{self.max_pixels} pixels, "
+                f"{self.hits} hits, {self.misses} misses)")
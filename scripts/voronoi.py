@@ -0,0 +1,129 @@
+import random
+
+import numpy as np
+
+# Sites share colors modulo this count, so the per-site palette fits the 16-bit
+# color index of PixelBuffer whatever the number of sites.
+SITE_PALETTE_SIZE = 4096
+
+_site_colors = []
+
+
+def site_colors(count):
+    """
+    Returns a (count, 3) uint8 array with the color of every site.
+    Colors are the ones the app has always used (random seeded with the site index)
+    and are generated only once per site index; site i takes the color of
+    i % SITE_PALETTE_SIZE.
+    """
+    for i in range(len(_site_colors), min(count, SITE_PALETTE_SIZE)):
+        random.seed(i)
+        _site_colors.append((random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)))
+    colors = np.array(_site_colors, dtype=np.uint8).reshape(-1, 3)
+    return colors[np.arange(count) % SITE_PALETTE_SIZE]
+
+
+def site_palette(count):
+    return ["#{:02x}{:02x}{:02x}".format(*rgb) for rgb in site_colors(count).tolist()]
+
+
+def voronoi_labels(sites, width, height, block=1 << 22):
+    """
+    Returns a (height, width) int32 image with the index of the nearest site of
+    every grid cell; ties go to the lower index, and every cell is -1 without sites.
+    Sites and rows are both processed in chunks of at most `block` cell-site
+    distances (at least one row by one site), keeping the running nearest site, so
+    the temporary arrays stay bounded whatever the number of sites.
+    """
+    sites = np.asarray(sites, dtype=np.float64).reshape(-1, 2)
+    labels = np.full((height, width), -1, dtype=np.int32)
+    if width == 0 or height == 0 or len(sites) == 0:
+        return labels
+    best = np.full((height, width), np.inf)
+    xs = np.arange(width, dtype=np.float64)
+    site_step = max(1, min(len(sites), block // width))
+    rows = max(1, block // (width * site_step))
+    for s0 in range(0, len(sites), site_step):
+        chunk = sites[s0:s0 + site_step]
+        dx2 = (xs[:, None] - chunk[None, :, 0]) ** 2
+        for y0 in range(0, height, rows):
+            ys = np.arange(y0, min(y0 + rows, height), dtype=np.float64)
+            dy2 = (ys[:, None] - chunk[None, :, 1]) ** 2
+            distance = dy2[:, None, :] + dx2[None, :, :]
+            nearest = np.argmin(distance, axis=2)
+            nearest_distance = np.take_along_axis(distance, nearest[:, :, None], axis=2)[:, :, 0]
+            # Earlier chunks hold lower indices, so only a strictly closer site replaces them.
+            closer = nearest_distance < best[y0:y0 + len(ys)]
+            best[y0:y0 + len(ys)][closer] = nearest_distance[closer]
+            labels[y0:y0 + len(ys)][closer] = nearest[closer] + s0
+    return labels
+
+
+def jump_flood_labels(sites, width, height):
+    """
+    Approximate nearest-site labels by jump flooding.
+    Every pass propagates labels from the 8 neighbours at distance `step`, with
+    `step` halving from the grid size down to 1 and one extra pass at 1, so the cost
+    is O(cells * log(grid size)) whatever the number of sites. Sites outside the grid
+    are seeded at the nearest border cell.
+    """
+    sites = np.asarray(sites, dtype=np.float64).reshape(-1, 2)
+    labels = np.full((height, width), -1, dtype=np.int32)
+    if width == 0 or height == 0 or len(sites) == 0:
+        return labels
+    cx = np.clip(np.rint(sites[:, 0]), 0, width - 1).astype(np.intp)
+    cy = np.clip(np.rint(sites[:, 1]), 0, height - 1).astype(np.intp)
+    # A cell keeps the site closest to it, the lower index on ties.
+    order = np.lexsort((np.arange(len(sites)), (sites[:, 0] - cx) ** 2 + (sites[:, 1] - cy) ** 2))
+    _, first = np.unique((cy * width + cx)[order], return_index=True)
+    seeded = order[first]
+    labels[cy[seeded], cx[seeded]] = seeded
+
+    xs = np.arange(width, dtype=np.float64)[None, :]
+    ys = np.arange(height, dtype=np.float64)[:, None]
+
+    def distance(candidate):
+        safe = np.maximum(candidate, 0)
+        d = (xs - sites[safe, 0]) ** 2 + (ys - sites[safe, 1]) ** 2
+        return np.where(candidate >= 0, d, np.inf)
+
+    best = distance(labels)
+    steps = []
+    step = 1 << max(0, (max(width, height) - 1).bit_length() - 1)
+    while step >= 1:
+        steps.append(step)
+        step //= 2
+    for step in steps + [1]:
+        for oy in (-step, 0, step):
+            for ox in (-step, 0, step):
+                if (ox == 0 and oy == 0) or abs(ox) >= width or abs(oy) >= height:
+                    continue
+                candidate = np.full_like(labels, -1)
+                candidate[max(0, -oy):height - max(0, oy), max(0, -ox):width - max(0, ox)] = \
+                    labels[max(0, oy):height - max(0, -oy), max(0, ox):width - max(0, -ox)]
+                d = distance(candidate)
+                better = (d < best) | ((d == best) & (candidate >= 0) & (candidate < labels))
+                labels[better] = candidate[better]
+                best[better] = d[better]
+    return labels
+
+
+def label_error(sites, labels, exact):
+    """Largest extra distance, in cells, of a cell's site in `labels` over its site in `exact`."""
+    sites = np.asarray(sites, dtype=np.float64).reshape(-1, 2)
+    height, width = labels.shape
+    xs = np.arange(width, dtype=np.float64)[None, :]
+    ys = np.arange(height, dtype=np.float64)[:, None]
+    approx = np.hypot(xs - sites[labels, 0], ys - sites[labels, 1])
+    nearest = np.hypot(xs - sites[exact, 0], ys - sites[exact, 1])
+    return float((approx - nearest).max()) if labels.size else 0.0
+
+
+def labels_to_pixels(labels, buffer):
+    """Appends the label image to a PixelBuffer column by column, colored per site."""
+    height, width = labels.shape
+    xs = np.repeat(np.arange(width), height)
+    ys = np.tile(np.arange(height), width)
+    count = int(labels.max()) + 1 if labels.size else 0
+    buffer.extend_arrays(xs, ys, site_palette(count), labels.T.ravel())
+    return buffer
@@ -0,0 +1,13 @@
+import pytest
+
+from tests.helpers import numpy_rng, python_rng
+
+
+@pytest.fixture
+def rng():
+    return numpy_rng()
+
+
+@pytest.fixture
+def py_rng():
+    return python_rng()
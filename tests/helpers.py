@@ -0,0 +1,37 @@
+"""Seeded random inputs shared by the randomized tests."""
+import random
+
+import numpy as np
+
+SEED = 0
+
+
+def numpy_rng(offset=0):
+    return np.random.default_rng(SEED + offset)
+
+
+def python_rng(offset=0):
+    return random.Random(SEED + offset)
+
+
+def random_polygon(rng, integer, size=20):
+    """A random polygon of 3 to 11 vertices in [0, size), possibly self-intersecting."""
+    count = int(rng.integers(3, 12))
+    if integer:
+        return [tuple(p) for p in rng.integers(0, size, size=(count, 2)).tolist()]
+    return [tuple(p) for p in (rng.random((count, 2)) * size).tolist()]
+
+
+def random_sites(rng, count, width, height):
+    """`count` integer sites spread over a width x height grid."""
+    return np.column_stack((rng.integers(0, width, count), rng.integers(0, height, count)))
+
+
+def random_simple_polygon(rng, size=40):
+    """A random star-shaped, usually concave, integer polygon: random points sorted by angle around the center."""
+    count = int(rng.integers(3, 14))
+    angles = np.sort(rng.random(count) * 2 * np.pi)
+    radii = (0.2 + 0.8 * rng.random(count)) * size / 2
+    xs = np.rint(size / 2 + radii * np.cos(angles)).astype(int)
+    ys = np.rint(size / 2 + radii * np.sin(angles)).astype(int)
+    return list(zip(xs.tolist(), ys.tolist()))
@@ -0,0 +1,48 @@
+from itertools import combinations
+
+from scripts.delaunay import Delaunay, super_triangle
+
+
+def brute_force_edges(points):
+    """Edges of every triangle whose circumcircle has no other point inside."""
+    edges = set()
+    for a, b, c in combinations(points, 3):
+        (ax, ay), (bx, by), (cx, cy) = a, b, c
+        d = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
+        if d == 0:
+            continue
+        ux = ((ax * ax + ay * ay) * (by - cy) + (bx * bx + by * by) * (cy - ay) + (cx * cx + cy * cy) * (ay - by)) / d
+        uy = ((ax * ax + ay * ay) * (cx - bx) + (bx * bx + by * by) * (ax - cx) + (cx * cx + cy * cy) * (bx - ax)) / d
+        r2 = (ax - ux) ** 2 + (ay - uy) ** 2
+        if all((px - ux) ** 2 + (py - uy) ** 2 >= r2 for px, py in points if (px, py) not in (a, b, c)):
+            edges.update(tuple(sorted(e)) for e in ((a, b), (b, c), (c, a)))
+    return edges
+
+
+def random_points(rng, count):
+    return [tuple(p) for p in (rng.random((count, 2)) * 500).tolist()]
+
+
+def test_edges_match_empty_circumcircles(rng):
+    # Like the Bowyer-Watson it replaced, the triangulation includes the enclosing
+    # triangle, which can cut thin hull triangles, so the brute force includes it too.
+    for trial in range(30):
+        points = random_points(rng, 30)
+        enclosing = super_triangle(points)
+        expected = {e for e in brute_force_edges(points + list(enclosing)) if not set(e) & set(enclosing)}
+        assert Delaunay.from_points(points, seed=trial).edges() == expected
+
+
+def test_insert_diffs_rebuild_edges(rng):
+    points = random_points(rng, 200)
+    triangulation = Delaunay(super_triangle(points))
+    edges = set()
+    for point in points:
+        change = triangulation.insert(point)
+        assert change is not None
+        removed, added = change
+        assert removed <= edges
+        assert not added & edges
+        edges = (edges - removed) | added
+        assert edges == triangulation.edges()
+    assert triangulation.insert(points[0]) is None
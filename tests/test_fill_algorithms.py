@@ -0,0 +1,42 @@
+import pytest
+
+from scripts.fill_algorithms import LBL, SpanLBL, Flood, ScanlineFlood
+from tests.helpers import random_polygon, random_simple_polygon
+
+PENTAGRAM = [(50, 0), (79, 90), (2, 35), (98, 35), (21, 90)]
+
+
+def span_pixels(spans):
+    return {(x, y) for x_start, y, x_end, _ in spans for x in range(x_start, x_end + 1)}
+
+
+def cell_pixels(cells):
+    return {(x, y) for x, y, _, _ in cells}
+
+
+@pytest.mark.parametrize("make", [random_simple_polygon, lambda rng: random_polygon(rng, True, size=40)],
+                         ids=["simple", "self-intersecting"])
+def test_span_lbl_matches_lbl(rng, make):
+    for _ in range(100):
+        polygon = make(rng)
+        expected = cell_pixels(LBL(polygon, 0, 0).get_points())
+        assert span_pixels(SpanLBL(polygon, 0, 0).get_points()) == expected, polygon
+
+
+def test_span_lbl_nonzero_pentagram():
+    even_odd = span_pixels(SpanLBL(PENTAGRAM, 0, 0).get_points())
+    nonzero = span_pixels(SpanLBL(PENTAGRAM, 0, 0, rule="nonzero").get_points())
+    assert (50, 45) not in even_odd
+    assert (50, 45) in nonzero
+    assert even_odd < nonzero
+
+
+def test_scanline_flood_matches_flood(rng):
+    for _ in range(60):
+        polygon = random_simple_polygon(rng)
+        # Seeds next to every vertex, on it, and at random points.
+        seeds = [(x + dx, y + dy) for x, y in polygon for dx, dy in ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1))]
+        seeds += [tuple(p) for p in rng.integers(0, 40, size=(5, 2)).tolist()]
+        for x, y in seeds:
+            expected = cell_pixels(Flood(polygon, x, y).get_points())
+            assert span_pixels(ScanlineFlood(polygon, x, y).get_points()) == expected, (polygon, x, y)
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from scripts.line_algorithms import BATCH_ALGORITHMS
+
+# Steep, horizontal, vertical, reversed and zero-length lines.
+SPECIAL = [(0, 0, 3, 17), (5, 5, 30, 5), (4, -2, 4, 25), (20, 11, -7, 3), (-3, 9, -3, 9), (6, 6, 0, 0)]
+
+
+def random_segments(rng, count=300):
+    segments = rng.integers(-40, 40, size=(count, 4))
+    return [tuple(s) for s in segments.tolist()] + SPECIAL
+
+
+@pytest.mark.parametrize("scalar", list(BATCH_ALGORITHMS), ids=lambda c: c.__name__)
+def test_batch_matches_scalar(rng, scalar):
+    segments = random_segments(rng)
+    batch = BATCH_ALGORITHMS[scalar](segments)
+    xs, ys, _, offsets = batch.get_arrays()
+    pixels = list(batch.get_points())
+    for i, segment in enumerate(segments):
+        expected = list(scalar(*segment).get_points())
+        assert pixels[offsets[i]:offsets[i + 1]] == expected, segment
+        assert list(zip(xs[offsets[i]:offsets[i + 1]].tolist(), ys[offsets[i]:offsets[i + 1]].tolist())) == \
+            [(x, y) for x, y, _ in expected]
@@ -0,0 +1,77 @@
+"""
+MidpointHyperbola and MidpointParabola on random sizes: every branch ends at
+(a, y_end) (or (w, y_end)), is 8-connected without duplicate pixels, and every
+pixel lies within 0.5 of the true curve along x or y.
+"""
+import math
+
+import pytest
+
+from scripts.curve_algorithms import MidpointHyperbola, MidpointParabola
+
+TRIALS = 3000
+
+
+def hyperbola_case(rng):
+    x1, y1 = rng.randint(0, 300), rng.randint(0, 600)
+    a = max(x1, 1)
+    b = max(y1 // 2, 1)
+
+    def curve_y(x):
+        return b * math.sqrt(1 + (x / a) ** 2)
+
+    def curve_x(y):
+        return a * math.sqrt(max(y * y / (b * b) - 1, 0))
+
+    def branch(xs, ys):
+        return [(x, y) for x, y in zip(xs, ys) if x >= 0 and y >= 0]
+
+    return MidpointHyperbola(0, 0, x1, y1), a, math.floor(curve_y(a) + 0.5), curve_x, curve_y, branch
+
+
+def parabola_case(rng):
+    x1, y1 = rng.randint(0, 300), rng.randint(0, 600)
+    w = x1
+    p = max(y1 // 2, 1)
+
+    def curve_y(x):
+        return x * x / (4 * p)
+
+    def curve_x(y):
+        return math.sqrt(4 * p * y)
+
+    def branch(xs, ys):
+        return [(x, y) for x, y in zip(xs, ys) if x >= 0]
+
+    return MidpointParabola(0, 0, x1, y1), w, math.floor(curve_y(w) + 0.5), curve_x, curve_y, branch
+
+
+def check_branch(points, end_x, end_y, curve_x, curve_y):
+    """Problems with the x >= 0 branch `points`, in drawing order, as a list of messages."""
+    problems = []
+    if len(set(points)) != len(points):
+        problems.append("duplicate pixels")
+    if points[-1] != (end_x, end_y):
+        problems.append(f"ends at {points[-1]} instead of {(end_x, end_y)}")
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        if max(abs(x1 - x0), abs(y1 - y0)) != 1:
+            problems.append(f"gap between {(x0, y0)} and {(x1, y1)}")
+            break
+    for x, y in points:
+        if min(abs(y - curve_y(x)), abs(x - curve_x(y))) > 0.5 + 1e-9:
+            problems.append(f"{(x, y)} is off the curve")
+            break
+    return problems
+
+
+@pytest.mark.parametrize("case", [hyperbola_case, parabola_case])
+def test_branches(py_rng, case):
+    failures = []
+    for _ in range(TRIALS):
+        algorithm, end_x, end_y, curve_x, curve_y, branch = case(py_rng)
+        xs, ys, _ = algorithm.get_points().as_arrays()
+        problems = check_branch(branch(xs.tolist(), ys.tolist()), end_x, end_y, curve_x, curve_y)
+        if problems:
+            failures.append(f"{type(algorithm).__name__}(0, 0, {algorithm.x1}, {algorithm.y1}): "
+                            f"{'; '.join(problems)}")
+    assert not failures, "\n".join(failures)
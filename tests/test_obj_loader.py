@@ -0,0 +1,84 @@
+"""
+The chunked OBJ parser in scripts/3d_algorithms.py against a plain line.split()
+reader on random files: indented lines, comments, CRLF endings, v/vt/vn references,
+negative indices and a missing final newline, at several chunk sizes.
+"""
+import importlib
+
+import numpy as np
+import pytest
+
+objects = importlib.import_module("scripts.3d_algorithms")
+
+TRIALS = 300
+
+
+def reference_load(filename):
+    vertices, faces = [], []
+    with open(filename, 'r') as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == 'v':
+                vertices.append([float(x) for x in parts[1:4]])
+            elif parts[0] == 'f':
+                face = []
+                for token in parts[1:]:
+                    index = int(token.split('/')[0])
+                    face.append(index + len(vertices) if index < 0 else index - 1)
+                faces.append(face)
+    return np.array(vertices, dtype=np.float32), faces
+
+
+def random_object(rng):
+    lines = []
+    vertex_count = 0
+    for _ in range(rng.randint(5, 200)):
+        indent = rng.choice(["", "", "", " ", "\t", "  \t"])
+        if vertex_count < 3 or rng.random() < 0.5:
+            x, y, z = (round(rng.uniform(-10, 10), 4) for _ in range(3))
+            lines.append(f"{indent}v {x} {y} {z}")
+            vertex_count += 1
+        else:
+            references = []
+            for _ in range(rng.randint(3, 5)):
+                i = rng.randrange(vertex_count)
+                index = str(i + 1) if rng.random() < 0.7 else str(i - vertex_count)
+                references.append(index + rng.choice(["", "/1", "/2/3", "//4"]))
+            lines.append(f"{indent}f " + " ".join(references))
+        if rng.random() < 0.1:
+            lines.append(rng.choice(["", "   ", "# comment", "vt 0.5 0.5", "vn 0 0 1"]))
+    lines.append("f 1 2 3")
+    newline = rng.choice(["\n", "\r\n"])
+    return newline.join(lines) + rng.choice(["", newline, newline + "  "])
+
+
+@pytest.mark.parametrize("chunk", [7, 64, 1 << 22])
+def test_matches_line_reader(py_rng, tmp_path, monkeypatch, chunk):
+    monkeypatch.setattr(objects, "OBJ_CHUNK_BYTES", chunk)
+    filename = tmp_path / "check.obj"
+    failures = []
+    for trial in range(TRIALS):
+        with open(filename, 'w', newline='') as f:
+            f.write(random_object(py_rng))
+        vertices, faces = reference_load(filename)
+        loaded, offsets, indices = objects.load_object(str(filename), use_cache=False)
+        if not (np.array_equal(loaded, vertices) and
+                [indices[offsets[k]:offsets[k + 1]].tolist() for k in range(len(offsets) - 1)] == faces):
+            failures.append(f"trial {trial}")
+    assert not failures, "mismatches in " + ", ".join(failures)
+
+
+def test_sidecar_cache(tmp_path):
+    """The sidecar cache is used while the file is unchanged and refreshed after an edit."""
+    filename = str(tmp_path / "cube.obj")
+    with open(filename, 'w') as f:
+        f.write("v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 3\n")
+    first = objects.load_object(filename)
+    cached = objects.load_object(filename)
+    assert (tmp_path / "cube.obj.npz").exists()
+    assert all(np.array_equal(a, b) for a, b in zip(first, cached))
+    with open(filename, 'a') as f:
+        f.write("v 1 1 0\nf 2 4 3\n")
+    assert len(objects.load_object(filename)[1]) == 3
@@ -0,0 +1,29 @@
+import numpy as np
+
+from scripts.curve_algorithms import Circle
+from scripts.line_algorithms import DDA, Bresenham, Wu
+from scripts.pixel_buffer import PixelBuffer
+
+
+def test_round_trip():
+    buffer = PixelBuffer()
+    buffer.append(1, 2, "red")
+    buffer.extend_arrays([3, 4], [5, 6], ["blue", "red"], [0, 1])
+    buffer.extend([(7, 8, "red")])
+    assert list(buffer) == [(1, 2, "red"), (3, 5, "blue"), (4, 6, "red"), (7, 8, "red")]
+    assert buffer.palette == ["red", "blue"]
+    assert list(buffer.translated(1, -1))[0] == (2, 1, "red")
+
+
+def test_float_coordinates_are_rounded():
+    buffer = PixelBuffer()
+    buffer.append(1.4, np.float64(2.6), "red")
+    buffer.extend_arrays(np.array([3.6, -0.4]), np.array([0.2, 5.0]), "red")
+    assert [(x, y) for x, y, _ in buffer] == [(1, 3), (4, 0), (0, 5)]
+
+
+def test_scalar_algorithms_accept_float_endpoints():
+    for algorithm in (Bresenham, Circle):
+        assert list(algorithm(2.0, 3.0, 9.0, 7.0).get_points()) == list(algorithm(2, 3, 9, 7).get_points())
+    for algorithm in (DDA, Wu):
+        assert [(x, y) for x, y, _ in algorithm(1.6, 2.4, 1.6, 2.4).get_points()] == [(2, 2)]
@@ -0,0 +1,96 @@
+"""
+The batch point-in-polygon tests in scripts/point_check.py against the scalar
+is_point_inside / is_on_boundary on random integer and float polygons, with query
+points inside, outside, on vertices and on edges.
+"""
+import time
+
+import numpy as np
+import pytest
+
+from scripts.point_check import (is_point_inside, is_on_boundary, points_inside, points_on_boundary,
+                                 PreparedPolygon)
+from tests.helpers import random_polygon
+
+TRIALS = 200
+
+
+def random_queries(rng, polygon, integer):
+    grid = [(x, y) for x in range(-1, 22) for y in range(-1, 22)]
+    starts = np.array(polygon, dtype=np.float64)
+    ends = np.roll(starts, -1, axis=0)
+    on_edges = (starts + ends) / 2
+    if integer:
+        queries = grid + [tuple(p) for p in on_edges.tolist()]
+    else:
+        queries = grid + [tuple(p) for p in (rng.random((200, 2)) * 22 - 1).tolist()]
+        queries += [tuple(p) for p in on_edges.tolist()]
+    return queries + list(polygon)
+
+
+# A small block also runs the edge chunking.
+@pytest.mark.parametrize("block", [1 << 22, 7])
+def test_batch_matches_scalar(rng, block):
+    failures = []
+    for trial in range(TRIALS):
+        integer = trial % 2 == 0
+        polygon = random_polygon(rng, integer)
+        queries = random_queries(rng, polygon, integer)
+        inside = [is_point_inside(polygon, x, y) for x, y in queries]
+        boundary = [is_on_boundary(polygon, x, y) for x, y in queries]
+        expected = {
+            "points_inside(boundary=True)": inside,
+            "points_inside(boundary=False)": [a and not b for a, b in zip(inside, boundary)],
+            "points_on_boundary": boundary,
+        }
+        masks = {
+            "points_inside(boundary=True)": points_inside(polygon, queries, block=block),
+            "points_inside(boundary=False)": points_inside(polygon, queries, boundary=False, block=block),
+            "points_on_boundary": points_on_boundary(polygon, queries, block=block),
+        }
+        for name, mask in masks.items():
+            wrong = np.flatnonzero(mask != np.array(expected[name]))
+            if len(wrong):
+                failures.append(f"{polygon}, {name}: {len(wrong)} mismatches, first at {queries[wrong[0]]}")
+    assert not failures, "\n".join(failures)
+
+
+def comb(teeth):
+    """A comb of `teeth` tall, thin teeth: almost every edge spans the whole height."""
+    points = []
+    for i in range(teeth):
+        points += [(4 * i, 0), (4 * i + 2, 0), (4 * i + 2, 1000), (4 * i + 4, 1000)]
+    return points + [(4 * teeth, -10), (0, -10)]
+
+
+def test_prepared_polygon_matches_scalar(rng):
+    polygons = [random_polygon(rng, trial % 2 == 0) for trial in range(100)] + [comb(20)]
+    for polygon in polygons:
+        prepared = PreparedPolygon(polygon)
+        queries = random_queries(rng, polygon, True) + [(9, 500), (10, 500), (11, 500), (6, -5)]
+        assert [prepared.is_point_inside(x, y) for x, y in queries] == \
+            [is_point_inside(polygon, x, y) for x, y in queries]
+        assert [prepared.is_on_boundary(x, y) for x, y in queries] == \
+            [is_on_boundary(polygon, x, y) for x, y in queries]
+
+
+def test_prepared_polygon_tall_edges_stay_linear():
+    polygon = PreparedPolygon(comb(1250))
+    start = time.perf_counter()
+    polygon.is_point_inside(1, 500)
+    assert time.perf_counter() - start < 1.0
+    assert sum(len(band) for band in polygon._bands) + len(polygon._long_edges) <= \
+        PreparedPolygon.LONG_EDGE_BANDS * len(polygon.points)
+
+
+def test_prepared_polygon_invalidate():
+    points = [(0, 0), (10, 0), (10, 10), (0, 10)]
+    polygon = PreparedPolygon(points)
+    assert polygon.is_point_inside(15, 5) is False
+    points[2] = (20, 10)
+    polygon.invalidate()
+    assert polygon.is_point_inside(15, 5) is True
+    points.append((-5, 5))
+    assert polygon.is_point_inside(-2, 5) is True
+    polygon.points = [(0, 0), (1, 0), (1, 1)]
+    assert polygon.is_point_inside(15, 5) is False
@@ -0,0 +1,32 @@
+import numpy as np
+
+from scripts.pixel_buffer import PixelBuffer
+from scripts.voronoi import SITE_PALETTE_SIZE, labels_to_pixels, site_colors, voronoi_labels
+from tests.helpers import random_sites
+
+
+def test_site_colors_cycle():
+    colors = site_colors(2 * SITE_PALETTE_SIZE + 3)
+    assert np.array_equal(colors[SITE_PALETTE_SIZE:2 * SITE_PALETTE_SIZE], colors[:SITE_PALETTE_SIZE])
+    assert np.array_equal(colors[-3:], colors[:3])
+
+
+def test_voronoi_labels_many_sites(rng):
+    sites = random_sites(rng, 100_000, 40, 30)
+    labels = voronoi_labels(sites, 40, 30, block=1 << 20)
+    d = (np.arange(40)[None, :, None] - sites[None, None, :, 0]) ** 2 + \
+        (np.arange(30)[:, None, None] - sites[None, None, :, 1]) ** 2
+    assert np.array_equal(labels, np.argmin(d, axis=2))
+
+
+def test_labels_to_pixels_100k_sites(rng):
+    # Every site owns one cell, so all 100k colors reach the buffer.
+    width, height = 400, 250
+    labels = rng.permutation(width * height).astype(np.int32).reshape(height, width)
+
+    buffer = labels_to_pixels(labels, PixelBuffer())
+    xs, ys, index = buffer.as_arrays()
+    assert len(buffer) == width * height
+    assert len(buffer.palette) <= SITE_PALETTE_SIZE
+    expected = ["#{:02x}{:02x}{:02x}".format(*rgb) for rgb in site_colors(width * height).tolist()]
+    assert [buffer.palette[i] for i in index[:1000]] == [expected[labels[y, x]] for x, y in zip(xs[:1000], ys[:1000])]